@@ -0,0 +1,337 @@
+import os
+import re
+import sys
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from types import CodeType
+from typing import Any
+from typing import NamedTuple
+from typing import TYPE_CHECKING
+
+from utils import root_dir
+
+if TYPE_CHECKING:
+    import tracemalloc
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+PHASES = ("input", "parse", "solution")
+# ru_maxrss is in bytes on macos, in KiB elsewhere
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    import statistics
+
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+class PhaseStats(NamedTuple):
+    phase: str
+    samples: list[float]
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        import statistics
+
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.samples, 95)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.phase:<8} min={format_seconds(self.min):>10} median={format_seconds(self.median):>10} "
+            f"p95={format_seconds(self.p95):>10} (n={len(self.samples)})"
+        )
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+def reset_max_rss() -> None:
+    """
+    Starts the peak RSS over from the current RSS, so max_rss covers what runs next. Only linux can reset it, elsewhere
+    it stays the peak of the whole process.
+    """
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def max_rss() -> int | None:
+    # bytes, the peak since reset_max_rss
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+class MemoryStats(NamedTuple):
+    peak: int
+    top: list[tuple[str, int]]
+
+    def __str__(self) -> str:
+        lines = [f"peak={format_bytes(self.peak)}"]
+        lines.extend(f"  {format_bytes(size):>10} {location}" for location, size in self.top)
+        return "\n".join(lines)
+
+
+class MemoryTracer:
+    """
+    Traces the allocations of a single call with tracemalloc. The snapshot is taken when the traced function returns,
+    while its locals are still alive, so the top lines show the working set instead of just the return value.
+    """
+
+    def __init__(self, func: Callable[..., Any], top: int = 10):
+        self.code = func.__code__
+        self.top = top
+        self.depth = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.tool_id: int | None = None
+        self.owns_tracing = False
+
+    def _on_start(self, code: CodeType, offset: int) -> None:
+        self.depth += 1
+
+    def _on_return(self, code: CodeType, offset: int, retval: Any) -> None:
+        self.depth -= 1
+        if self.depth == 0:
+            import tracemalloc
+
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def start(self) -> None:
+        import tracemalloc
+
+        monitoring = sys.monitoring
+        self.tool_id = next(i for i in range(6) if monitoring.get_tool(i) is None)
+        monitoring.use_tool_id(self.tool_id, "memory tracer")
+        monitoring.register_callback(self.tool_id, monitoring.events.PY_START, self._on_start)
+        monitoring.register_callback(self.tool_id, monitoring.events.PY_RETURN, self._on_return)
+        monitoring.set_local_events(self.tool_id, self.code, monitoring.events.PY_START | monitoring.events.PY_RETURN)
+        self.owns_tracing = not tracemalloc.is_tracing()
+        if self.owns_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+
+    def stop(self) -> MemoryStats:
+        import tracemalloc
+
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = self.snapshot or tracemalloc.take_snapshot()
+        if self.owns_tracing:
+            tracemalloc.stop()
+        monitoring = sys.monitoring
+        monitoring.set_local_events(self.tool_id, self.code, 0)
+        monitoring.register_callback(self.tool_id, monitoring.events.PY_START, None)
+        monitoring.register_callback(self.tool_id, monitoring.events.PY_RETURN, None)
+        monitoring.free_tool_id(self.tool_id)
+
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        top = []
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            frame = stat.traceback[0]
+            top.append((f"{frame.filename}:{frame.lineno}", stat.size))
+        return MemoryStats(peak, top)
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+    def __str__(self) -> str:
+        return f"{format_seconds(self.cumulative):>10} {format_seconds(self.self_time):>10}  {self.module}"
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime`. Entries come children first, like the report does,
+    and a module only counts for whoever imported it first.
+    """
+    import subprocess
+
+    src_dir = root_dir().joinpath("src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(src_dir), str(root_dir())])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, env=env
+    )
+    if result.returncode:
+        raise ImportError(result.stderr.strip().splitlines()[-1], name=module)
+    times = []
+    for line in result.stderr.splitlines():
+        if match := IMPORT_TIME.match(line):
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append(ImportTime(name, int(self_us) / 1e6, int(cumulative_us) / 1e6, len(indent) // 2))
+    return times
+
+
+def direct_imports(times: list[ImportTime], module: str) -> list[ImportTime]:
+    # most expensive first
+    index = next(i for i, entry in enumerate(times) if entry.module == module)
+    depth = times[index].depth
+    children = []
+    for entry in reversed(times[:index]):
+        if entry.depth <= depth:
+            break
+        if entry.depth == depth + 1:
+            children.append(entry)
+    return sorted(children, key=lambda entry: entry.cumulative, reverse=True)
+
+
+def history_path() -> Path:
+    return root_dir().joinpath("io", "bench_history.jsonl")
+
+
+def git_commit() -> str | None:
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=root_dir(), capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class BenchRecord(NamedTuple):
+    year: int
+    day: int
+    part: int
+    phase: str
+    median: float
+    peak: int | None
+    commit: str | None
+    python: str
+    timestamp: str
+
+    @property
+    def key(self) -> tuple[int, int, int, str, str]:
+        # timings of different interpreters aren't comparable
+        return self.year, self.day, self.part, self.phase, self.python
+
+    def of_commit(self, commit: str) -> bool:
+        # a prefix of the commit hash, a dirty tree counts as its commit
+        return self.commit is not None and self.commit.removesuffix("-dirty").startswith(commit.removesuffix("-dirty"))
+
+    @property
+    def name(self) -> str:
+        return f"Y{self.year:04}D{self.day:02}P{self.part:02} {self.phase}"
+
+
+def create_records(
+    year: int, day: int, part: int, stats: dict[str, PhaseStats], memory: dict[str, MemoryStats] | None = None
+) -> list[BenchRecord]:
+    import platform
+
+    memory = memory or {}
+    commit = git_commit()
+    python = platform.python_version()
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    return [
+        BenchRecord(
+            year,
+            day,
+            part,
+            phase,
+            phase_stats.median,
+            memory[phase].peak if phase in memory else None,
+            commit,
+            python,
+            timestamp,
+        )
+        for phase, phase_stats in stats.items()
+    ]
+
+
+def append_history(records: list[BenchRecord], path: Path | None = None) -> None:
+    path = path or history_path()
+    import json
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        for record in records:
+            f.write(json.dumps(record._asdict()) + "\n")
+
+
+def load_history(path: Path | None = None) -> list[BenchRecord]:
+    path = path or history_path()
+    if not path.exists():
+        return []
+    import json
+
+    with path.open() as f:
+        return [BenchRecord(**json.loads(line)) for line in f if line.strip()]
+
+
+class Regression(NamedTuple):
+    baseline: BenchRecord
+    current: BenchRecord
+
+    @property
+    def ratio(self) -> float:
+        return self.current.median / self.baseline.median
+
+    def __str__(self) -> str:
+        return (
+            f"{self.current.name}: {format_seconds(self.baseline.median)} ({self.baseline.commit}) -> "
+            f"{format_seconds(self.current.median)} ({self.current.commit}) x{self.ratio:.2f}"
+        )
+
+
+def find_regressions(
+    history: list[BenchRecord], threshold: float = 0.1, baseline_commit: str | None = None, window: int = 5
+) -> list[Regression]:
+    """
+    Compares the latest record of every year/day/part/phase/python against its baseline: the latest record of
+    `baseline_commit` if given, otherwise the fastest of the `window` records before the latest one, so a slowdown
+    spread over several commits still adds up. Raises LookupError if no record is of `baseline_commit`.
+    """
+    if baseline_commit is not None and not any(record.of_commit(baseline_commit) for record in history):
+        raise LookupError(f"No benchmark record of commit {baseline_commit}")
+    records_by_key: dict[tuple[int, int, int, str, str], list[BenchRecord]] = {}
+    for record in history:
+        records_by_key.setdefault(record.key, []).append(record)
+
+    regressions = []
+    for records in records_by_key.values():
+        current = records[-1]
+        if baseline_commit is None:
+            baseline = min(records[-1 - window : -1], key=lambda r: r.median, default=None)
+        else:
+            baseline = next((r for r in reversed(records[:-1]) if r.of_commit(baseline_commit)), None)
+        if baseline is None or baseline.median <= 0:
+            continue
+        regression = Regression(baseline, current)
+        if regression.ratio > 1 + threshold:
+            regressions.append(regression)
+    return regressions
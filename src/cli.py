@@ -0,0 +1,302 @@
+import sys
+from collections.abc import Callable
+from typing import Any
+
+import click
+from bench import direct_imports
+from bench import find_regressions
+from bench import format_seconds
+from bench import history_path
+from bench import import_times
+from bench import load_history
+from daemon import is_running
+from daemon import serve
+from daemon import SOCKET_PATH
+from daemon import stop
+from fuzz import check_fuzzable
+from fuzz import fuzz as fuzz_part
+from fuzz import save_regression
+from runner import Daywalker
+from runner import Limits
+from runner import load_runner
+from runner import puzzle_modules
+from runner import RunOptions
+from stress import COMPLEXITIES
+from stress import find_generator
+from stress import fit_complexity
+from stress import stress as stress_part
+from utils import Color
+from utils import create_banner
+from watch import Watcher
+
+
+def limit_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    options = [
+        click.option("--timeout", type=float, default=None, help="Wall time limit per part in seconds"),
+        click.option("--cpu-limit", type=int, default=None, help="CPU time limit per part in seconds"),
+        click.option("--memory-limit", type=int, default=None, help="Address space limit per part in MiB"),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def create_limits(timeout: float | None, cpu_limit: int | None, memory_limit: int | None) -> Limits | None:
+    # any limit runs each part in its own process
+    if timeout is None and cpu_limit is None and memory_limit is None:
+        return None
+    return Limits(timeout, cpu_limit, None if memory_limit is None else memory_limit * 1024 * 1024)
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command()
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Defaults to every year")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Defaults to every day")
+@click.option("-w", "--workers", type=int, default=None, help="Defaults to the cpu count")
+@click.option("--recompute", is_flag=True, help="Ignores cached answers")
+@click.option("--profile", is_flag=True, help="Saves cProfile stats to io/yYYYY/output/profiles")
+@click.option("--memory", is_flag=True, help="Traces peak memory and top allocations")
+@limit_options
+def batch(
+    years: tuple[int, ...],
+    days: tuple[int, ...],
+    workers: int | None,
+    recompute: bool,
+    profile: bool,
+    memory: bool,
+    timeout: float | None,
+    cpu_limit: int | None,
+    memory_limit: int | None,
+) -> None:
+    """Runs every part of every day, each in a fresh worker process"""
+    limits = create_limits(timeout, cpu_limit, memory_limit)
+    options = RunOptions(recompute=recompute, profile=profile, memory=memory, limits=limits)
+    results = Daywalker(list(years), list(days), workers, options).run()
+    if not all(result.status.ok for result in results):
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("-y", "--year", type=int, required=True)
+@click.argument("day", type=int)
+@click.option("-p", "--part", type=int, default=None, help="Defaults to every part")
+@click.option("--debugging", is_flag=True, help="Shows the solution output")
+@click.option("--recompute", is_flag=True, help="Ignores cached answers")
+@click.option("--profile", is_flag=True, help="Saves cProfile stats to io/yYYYY/output/profiles")
+@click.option("--memory", is_flag=True, help="Traces peak memory and top allocations")
+@click.option("-j", "--test-workers", type=int, default=1, help="Runs the test cases in a process pool")
+@click.option("--eager", is_flag=True, help="Runs the puzzle input alongside the test cases")
+@limit_options
+def run(
+    year: int,
+    day: int,
+    part: int | None,
+    debugging: bool,
+    recompute: bool,
+    profile: bool,
+    memory: bool,
+    test_workers: int,
+    eager: bool,
+    timeout: float | None,
+    cpu_limit: int | None,
+    memory_limit: int | None,
+) -> None:
+    """Runs a day like its runner script does"""
+    runner = load_runner(year, day)
+    limits = create_limits(timeout, cpu_limit, memory_limit)
+    results = runner.run(
+        part,
+        debugging=debugging,
+        recompute=recompute,
+        profile=profile,
+        memory=memory,
+        limits=limits,
+        test_workers=test_workers,
+        eager_input=eager,
+    )
+    if not all(result.status.ok for result in results):
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("-y", "--year", type=int, required=True)
+@click.argument("day", type=int)
+@click.option("-p", "--part", type=int, default=None, help="Defaults to every part")
+@click.option("--warmup", type=int, default=1, show_default=True)
+@click.option("--repeat", type=int, default=5, show_default=True)
+@click.option("--memory", is_flag=True, help="Also measures peak memory per phase")
+@click.option("--record", is_flag=True, help="Appends the results to io/bench_history.jsonl")
+def bench(year: int, day: int, part: int | None, warmup: int, repeat: int, memory: bool, record: bool) -> None:
+    """Times reading, parsing and solving the puzzle input"""
+    load_runner(year, day).benchmark(part, warmup=warmup, repeat=repeat, memory=memory, record=record)
+
+
+@cli.command()
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Defaults to every year")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Defaults to every day")
+@click.option("-n", "--top", type=int, default=5, show_default=True, help="Direct imports shown per module")
+def imports(years: tuple[int, ...], days: tuple[int, ...], top: int) -> None:
+    """Reports what importing each puzzle module costs, measured with -X importtime in a fresh interpreter"""
+    for module in puzzle_modules(list(years), list(days)):
+        try:
+            times = import_times(module)
+        except ImportError as ex:
+            click.echo(f"{module} {Color.fail(ex)}")
+            continue
+        total = next(entry for entry in times if entry.module == module)
+        click.echo(f"{module} {Color.info(format_seconds(total.cumulative))}")
+        for entry in direct_imports(times, module)[:top]:
+            click.echo(f"  {entry}")
+
+
+@cli.command()
+@click.option("-y", "--year", type=int, required=True)
+@click.argument("day", type=int)
+@click.option("--debugging", is_flag=True, help="Shows the solution output")
+@click.option("--recompute", is_flag=True, help="Ignores cached answers")
+@click.option("-j", "--test-workers", type=int, default=1, help="Runs the test cases in a process pool")
+@click.option("--eager", is_flag=True, help="Runs the puzzle input alongside the test cases")
+@click.option("-i", "--interval", type=float, default=0.5, show_default=True, help="Seconds between polls")
+def watch(
+    year: int, day: int, debugging: bool, recompute: bool, test_workers: int, eager: bool, interval: float
+) -> None:
+    """Re-runs the parts of a day whose source, input or runner script changed"""
+    watcher = Watcher(
+        year,
+        day,
+        interval,
+        debugging=debugging,
+        recompute=recompute,
+        test_workers=test_workers,
+        eager_input=eager,
+    )
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command()
+@click.option("--stop", "stop_daemon", is_flag=True, help="Stops the running daemon")
+def daemon(stop_daemon: bool) -> None:
+    """Keeps a warm interpreter around for `python src/daemon.py`"""
+    if stop_daemon:
+        if not stop():
+            raise click.ClickException("Daemon is not running")
+        return
+    if is_running():
+        raise click.ClickException(f"Daemon is already listening on {SOCKET_PATH}")
+    click.echo(f"Listening on {SOCKET_PATH}")
+    serve()
+
+
+@cli.command()
+@click.option("-y", "--year", type=int, required=True)
+@click.argument("day", type=int)
+@click.option("-p", "--part", type=int, default=None, help="Defaults to every part")
+@click.option("--warmup", type=int, default=1, show_default=True)
+@click.option("--repeat", type=int, default=5, show_default=True)
+def strategies(year: int, day: int, part: int | None, warmup: int, repeat: int) -> None:
+    """Cross-checks and benchmarks the alternative strategies of a day"""
+    runner = load_runner(year, day)
+    if not runner.compare(part, warmup=warmup, repeat=repeat):
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("-y", "--year", type=int, required=True)
+@click.argument("day", type=int)
+@click.option("-p", "--part", type=int, default=1, show_default=True)
+@click.option("-s", "--scale", "scales", type=int, multiple=True, help="Defaults to 1, 2, 4 and 8")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--budget", type=float, default=10.0, show_default=True, help="Stops after a scale slower than this")
+@click.option("-r", "--repeat", type=int, default=1, show_default=True, help="Keeps the fastest run per phase")
+@click.option("--limit", type=click.Choice(list(COMPLEXITIES)), default=None, help="Fails on a worse fitted complexity")
+def stress(
+    year: int, day: int, part: int, scales: tuple[int, ...], seed: int, budget: float, repeat: int, limit: str | None
+) -> None:
+    """Runs a part on generated inputs of increasing size and fits the complexity of each phase"""
+    if find_generator(year, day) is None:
+        raise click.ClickException(f"Day {day} of {year} has no generate_input")
+    click.echo(create_banner(f"Y{year:04}D{day:02}P{part:02} - STRESS (seed={seed})"))
+    click.echo(f"{'scale':>6} {'size':>10} {'parse':>10} {'solution':>10} {'total':>10} {'growth':>7}")
+    points = []
+    for point in stress_part(year, day, part, list(scales or (1, 2, 4, 8)), seed, budget, repeat):
+        parse = format_seconds(point.timings["parse"]) if "parse" in point.timings else "-"
+        growth = f"x{point.total / points[-1].total:.1f}" if points else ""
+        click.echo(
+            f"{point.scale:>6} {point.size:>10,} {parse:>10} {format_seconds(point.timings['solution']):>10} "
+            f"{format_seconds(point.total):>10} {growth:>7}"
+        )
+        points.append(point)
+    exceeded = False
+    for phase in ("parse", "solution"):
+        if (fit := fit_complexity(points, phase)) is None:
+            continue
+        if limit is not None and fit.worse_than(limit):
+            click.echo(Color.fail(f"{fit} (limit O({limit}))"))
+            exceeded = True
+        else:
+            click.echo(Color.info(str(fit)))
+    if exceeded:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("-y", "--year", type=int, required=True)
+@click.argument("day", type=int)
+@click.option("-p", "--part", type=int, default=1, show_default=True)
+@click.option("-n", "--runs", type=int, default=1000, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("-j", "--workers", type=int, default=None, help="Defaults to the number of CPUs")
+@click.option("--oracle", default="brute_force", show_default=True, help="Strategy trusted for the expected answer")
+@click.option("--save", is_flag=True, help="Adds the shrunk input as a test to the runner script")
+def fuzz(year: int, day: int, part: int, runs: int, seed: int, workers: int | None, oracle: str, save: bool) -> None:
+    """Checks the strategies of a part against each other on random inputs"""
+    try:
+        check_fuzzable(year, day, part)
+    except LookupError as ex:
+        raise click.ClickException(str(ex))
+    click.echo(create_banner(f"Y{year:04}D{day:02}P{part:02} - FUZZ (seed={seed}, runs={runs})"))
+    disagreement = fuzz_part(year, day, part, runs, seed, workers)
+    if disagreement is None:
+        click.echo(Color.success(f"All strategies agree on {runs} inputs"))
+        return
+    click.echo(Color.fail(f"Strategies disagree (seed={disagreement.seed}), shrunk input:"))
+    click.echo(disagreement.data)
+    for name, answer in disagreement.answers.items():
+        click.echo(f"{name:>20}: {answer!r}")
+    if save:
+        if oracle not in disagreement.answers:
+            raise click.ClickException(f"No strategy named {oracle}")
+        script = save_regression(year, day, part, disagreement.data, disagreement.answers[oracle])
+        click.echo(Color.info(f"Added the test to {script}"))
+    sys.exit(1)
+
+
+@cli.command()
+@click.option("-t", "--threshold", type=float, default=0.1, show_default=True, help="Allowed slowdown ratio")
+@click.option("-b", "--baseline", default=None, help="Commit (prefix) to compare to, else the fastest recent record")
+@click.option("-n", "--window", type=int, default=5, show_default=True, help="Records the default baseline spans")
+def compare(threshold: float, baseline: str | None, window: int) -> None:
+    """Flags benchmarks slower than their baseline in the history"""
+    history = load_history()
+    if not history:
+        raise click.ClickException(f"No benchmark history in {history_path()}, use bench --record")
+    try:
+        regressions = find_regressions(history, threshold, baseline, window)
+    except LookupError as ex:
+        raise click.ClickException(str(ex))
+    for regression in regressions:
+        click.echo(Color.fail(str(regression)))
+    if regressions:
+        sys.exit(1)
+    click.echo(Color.success(f"No regressions over {threshold:.0%}"))
+
+
+if __name__ == "__main__":
+    cli()
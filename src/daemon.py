@@ -0,0 +1,226 @@
+# A warm interpreter for runs: `cli.py daemon` keeps the dependencies and the framework imported and listens on
+# io/daemon.sock, `python src/daemon.py -y 2025 8` submits a run to it. Every run gets a forked copy of the daemon.
+# Changed day modules are reloaded before forking, any other change under src restarts the daemon.
+import argparse
+import importlib
+import io
+import json
+import os
+import re
+import socket
+import sys
+import time
+import traceback
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+
+# stdlib only above, submitting a run has to start fast
+SRC_DIR = Path(__file__).parent
+SOCKET_PATH = SRC_DIR.parent.joinpath("io", "daemon.sock")
+DAY_MODULE = re.compile(r"y\d{4}\.d\d+(p\d+)?")
+
+
+class SocketWriter(io.TextIOBase):
+    def __init__(self, connection: socket.socket, tty: bool) -> None:
+        super().__init__()
+        self.connection = connection
+        self.tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        # lets click keep the colors when the client is a terminal
+        return self.tty
+
+    def write(self, s: str) -> int:
+        if not isinstance(s, str):
+            # click probes for a binary writer, it has to fall back to text
+            raise TypeError(f"string argument expected, got {type(s).__name__}")
+        if s:
+            send(self.connection, output=s)
+        return len(s)
+
+
+def send(connection: socket.socket, **message: Any) -> None:
+    connection.sendall(f"{json.dumps(message)}\n".encode())
+
+
+def module_mtimes() -> dict[str, int]:
+    mtimes = {}
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file and Path(file).is_relative_to(SRC_DIR):
+            try:
+                mtimes[name] = Path(file).stat().st_mtime_ns
+            except OSError:
+                pass
+    return mtimes
+
+
+def reload_module(name: str) -> None:
+    try:
+        importlib.reload(sys.modules[name])
+    except Exception:
+        # the run imports it again and reports the error
+        sys.modules.pop(name, None)
+
+
+def import_day(year: int, day: int) -> None:
+    from aoc import AdventOfCode
+
+    try:
+        importlib.import_module(AdventOfCode.puzzle_module(year, day))
+    except Exception:
+        pass
+
+
+def run(connection: socket.socket, request: dict[str, Any]) -> int:
+    from runner import load_runner
+
+    code = 1
+    with redirect_stdout(SocketWriter(connection, request["tty"])), redirect_stderr(SocketWriter(connection, False)):
+        try:
+            runner = load_runner(request["year"], request["day"])
+            results = runner.run(request["part"], **request["options"])
+            code = 0 if all(result.status.ok for result in results) else 1
+        except Exception:
+            traceback.print_exc()
+    send(connection, exit=code)
+    return code
+
+
+def reap() -> None:
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def is_running(path: Path = SOCKET_PATH) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(str(path))
+    except OSError:
+        return False
+    return True
+
+
+def serve(path: Path = SOCKET_PATH) -> None:
+    from runner import HEAVY_MODULES
+    from runner import PRELOAD_MODULES
+
+    for name in [*PRELOAD_MODULES, *HEAVY_MODULES]:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    mtimes = module_mtimes()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        try:
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    request = json.loads(connection.makefile("r").readline())
+                    if request.get("stop"):
+                        return
+                    current = module_mtimes()
+                    changed = [name for name, mtime in current.items() if mtimes.get(name, mtime) != mtime]
+                    if any(not DAY_MODULE.fullmatch(name) for name in changed):
+                        # the framework can't be reloaded in place, the client resubmits to the new daemon
+                        server.close()
+                        path.unlink(missing_ok=True)
+                        send(connection, restart=True)
+                        os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
+                    for name in changed:
+                        reload_module(name)
+                    import_day(request["year"], request["day"])
+                    mtimes = module_mtimes()
+                    if os.fork() == 0:
+                        server.close()
+                        os._exit(run(connection, request))
+                reap()
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def connect(path: Path, timeout: float = 0.0) -> socket.socket | None:
+    deadline = time.monotonic() + timeout
+    while True:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(str(path))
+            return connection
+        except OSError:
+            connection.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+
+
+def submit(request: dict[str, Any], path: Path = SOCKET_PATH, timeout: float = 0.0) -> int | None:
+    """
+    Streams the output of the run to stdout and returns its exit code, None if no daemon is listening.
+    """
+    connection = connect(path, timeout)
+    if connection is None:
+        return None
+    with connection:
+        send(connection, **request)
+        if request.get("stop"):
+            return 0
+        for line in connection.makefile("r"):
+            message = json.loads(line)
+            if "output" in message:
+                sys.stdout.write(message["output"])
+                sys.stdout.flush()
+            elif "restart" in message:
+                return submit(request, path, timeout=30.0)
+            elif "exit" in message:
+                return message["exit"]
+    print("daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+def stop(path: Path = SOCKET_PATH) -> bool:
+    return submit({"stop": True}, path) is not None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs a day on the warm daemon, same options as `cli.py run`")
+    parser.add_argument("-y", "--year", type=int, required=True)
+    parser.add_argument("day", type=int)
+    parser.add_argument("-p", "--part", type=int, default=None)
+    parser.add_argument("--debugging", action="store_true")
+    parser.add_argument("--recompute", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--memory", action="store_true")
+    parser.add_argument("-j", "--test-workers", type=int, default=1)
+    parser.add_argument("--eager", action="store_true")
+    args = parser.parse_args()
+    options = {
+        "debugging": args.debugging,
+        "recompute": args.recompute,
+        "profile": args.profile,
+        "memory": args.memory,
+        "test_workers": args.test_workers,
+        "eager_input": args.eager,
+    }
+    request = {"year": args.year, "day": args.day, "part": args.part, "options": options, "tty": sys.stdout.isatty()}
+    code = submit(request)
+    if code is None:
+        print("daemon is not running, running locally", file=sys.stderr)
+        cli = SRC_DIR.joinpath("cli.py")
+        os.execv(sys.executable, [sys.executable, str(cli), "run", *sys.argv[1:]])
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
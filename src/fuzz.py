@@ -0,0 +1,125 @@
+# Differential fuzzing of the strategies of a part (see `puzzle.strategy`). A day opts in with a module level
+# `fuzz_input(rng: random.Random) -> str` returning a small valid input, small enough for its brute force. Inputs are
+# checked in `warm_context` worker processes, the first disagreement is shrunk to a minimal input and can be saved to the
+# runner script as a regression test, the oracle's answer being the expected one. A day can shrink its inputs itself with
+# a module level `fuzz_shrink(data: str) -> Iterator[str]` yielding smaller variants, biggest cuts first.
+import random
+import re
+from collections.abc import Callable
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+
+from puzzle import Puzzle
+from runner import import_puzzle_module
+from runner import runner_script_path
+from runner import warm_context
+
+from aoc import AdventOfCode
+
+type InputFactory = Callable[[random.Random], str]
+type Shrinker = Callable[[str], Iterator[str]]
+
+INTEGER = re.compile(r"\d+")
+RUN_CALL = re.compile(r"^([ \t]*)(\w+)\.run\(", re.MULTILINE)
+
+
+class Disagreement(NamedTuple):
+    seed: int
+    data: str
+    answers: dict[str, Any]
+
+
+def find_input_factory(year: int, day: int) -> InputFactory | None:
+    return getattr(import_puzzle_module(year, day), "fuzz_input", None)
+
+
+def create_puzzle(year: int, day: int, part: int) -> Puzzle:
+    return getattr(import_puzzle_module(year, day), AdventOfCode.puzzle_class(day, part))()
+
+
+def strategy_answers(puzzle: Puzzle, data: str) -> dict[str, Any]:
+    # an exception is an answer too, it never matches a real one
+    answers = {}
+    for name, func in puzzle.strategies().items():
+        try:
+            with puzzle.capture_output(False):
+                answers[name] = func(puzzle.parse_data(data))
+        except Exception as ex:
+            answers[name] = f"{type(ex).__name__}: {ex}"
+    return answers
+
+
+def check_seed(year: int, day: int, part: int, seed: int) -> Disagreement | None:
+    return check_data(year, day, part, seed, find_input_factory(year, day)(random.Random(seed)))
+
+
+def check_data(year: int, day: int, part: int, seed: int, data: str) -> Disagreement | None:
+    answers = strategy_answers(create_puzzle(year, day, part), data)
+    return Disagreement(seed, data, answers) if len(set(map(repr, answers.values()))) > 1 else None
+
+
+def shrink_candidates(data: str) -> Iterator[str]:
+    """
+    Smaller variants of an input, biggest cuts first: without one of its lines (or comma separated items for a single
+    line), then with one of its integers made smaller but still positive.
+    """
+    separator = "\n" if "\n" in data else ","
+    items = data.split(separator)
+    if len(items) > 1:
+        for i in range(len(items)):
+            yield separator.join(items[:i] + items[i + 1 :])
+    for match in INTEGER.finditer(data):
+        value = int(match.group())
+        for smaller in sorted({value // 10, value // 2, value - 1}):
+            if 0 < smaller < value:
+                yield f"{data[: match.start()]}{smaller}{data[match.end() :]}"
+
+
+def shrink(year: int, day: int, part: int, disagreement: Disagreement, pool: Any) -> Disagreement:
+    # greedy, the first smaller input that still disagrees replaces the current one until none does
+    candidates = getattr(import_puzzle_module(year, day), "fuzz_shrink", shrink_candidates)
+    current = disagreement
+    while True:
+        check = partial(check_data, year, day, part, current.seed)
+        smaller = next((found for found in pool.imap(check, candidates(current.data)) if found), None)
+        if smaller is None:
+            return current
+        current = smaller
+
+
+def check_fuzzable(year: int, day: int, part: int) -> None:
+    if find_input_factory(year, day) is None:
+        raise LookupError(f"Day {day} of {year} has no fuzz_input")
+    if len(create_puzzle(year, day, part).strategies()) < 2:
+        raise LookupError(f"Part {part} of day {day} of {year} has no other strategy to compare with")
+
+
+def fuzz(year: int, day: int, part: int, runs: int, seed: int = 0, workers: int | None = None) -> Disagreement | None:
+    """
+    Checks `runs` inputs from consecutive seeds, returns the first disagreement shrunk, or None if all strategies agree.
+    """
+    check_fuzzable(year, day, part)
+    with warm_context().Pool(workers) as pool:
+        check = partial(check_seed, year, day, part)
+        for disagreement in pool.imap_unordered(check, range(seed, seed + runs), chunksize=16):
+            if disagreement:
+                return shrink(year, day, part, disagreement, pool)
+    return None
+
+
+def save_regression(year: int, day: int, part: int, data: str, expected: Any) -> Path:
+    # the test goes right before the runner's run call
+    script = runner_script_path(year, day)
+    if not script.exists():
+        raise FileNotFoundError(f"No runner script at {script}")
+    source = script.read_text()
+    match = RUN_CALL.search(source)
+    if match is None:
+        raise ValueError(f"No run call in {script}")
+    indent, name = match.groups()
+    test = f"{indent}{name}.add_test({part}, {data!r}, {expected!r})\n"
+    script.write_text(f"{source[: match.start()]}{test}{source[match.start() :]}")
+    return script
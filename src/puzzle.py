@@ -1,37 +1,127 @@
 import inspect
 import io
+import os
 import re
+import time
+import traceback
 from abc import ABC
 from abc import abstractmethod
+from collections import deque
+from collections.abc import Callable
 from contextlib import contextmanager
 from contextlib import redirect_stderr
 from contextlib import redirect_stdout
+from enum import IntEnum
 from functools import wraps
 from pathlib import Path
 from typing import Any
 from typing import Generator
+from typing import NamedTuple
+from typing import TYPE_CHECKING
 
 import click
+from bench import max_rss
+from bench import MemoryStats
+from bench import MemoryTracer
+from bench import PHASES
+from bench import PhaseStats
+from bench import reset_max_rss
 from utils import Color
 from utils import create_banner
 from utils import crop
+from utils import Grid
 from utils import MISSING
 from utils import root_dir
 
 from aoc import AdventOfCode
 
+if TYPE_CHECKING:
+    import cProfile
+
+
+PROFILED_PHASES = ("parse", "solution")
+
+
+class CaseResult(NamedTuple):
+    # test index, None for the puzzle input
+    index: int | None
+    passed: bool
+    solution: Any
+    timings: dict[str, float]
+    output: str
+    error: Exception | None = None
+
+
+class Verbosity(IntEnum):
+    INFO = 1
+    DEBUG = 2
+    # only when debugging, never captured
+    TRACE = 3
+
+
+def render(*args: Any) -> str:
+    return " ".join(str(arg() if callable(arg) else arg) for arg in args)
+
+
+def render_log(msg: str, *args: Any) -> str:
+    return msg % tuple(arg() if callable(arg) else arg for arg in args) if args else msg
+
+
+def strategy[F: Callable[..., Any]](name: str) -> Callable[[F], F]:
+    """
+    Registers a method as an alternative to `solution`: same parsed data, same answer, e.g. a naive reference
+    implementation. `Runner.compare` checks that they agree and benchmarks them side by side.
+    """
+
+    def decorator(func: F) -> F:
+        func.strategy = name
+        return func
+
+    return decorator
+
 
 class Puzzle(ABC):
+    # captured output above this level is dropped without being formatted
+    capture_verbosity: Verbosity = Verbosity.DEBUG
+
+    # captured output only keeps its tail, capture_spill also writes the full log to output/logs
+    capture_max_lines: int | None = 10_000
+    capture_max_chars: int | None = 4 * 1024 * 1024
+    capture_spill: bool = False
+
+    # opt-in: set to an int to cache parse_data results for the puzzle input, bump it whenever parse_data changes
+    parse_cache_version: int | None = None
+
+    # set by watch mode: the last parse_data result of each parser, pickled and kept across module reloads
+    parse_memo: dict[str, tuple[str, bytes]] | None = None
+
     def __init__(self):
+        self.year, self.day, self.part = self.identify()
+        self._divider_width: int = 42
+        self.answer: Any = MISSING
+        self.timings: dict[str, float] = {}
+        self.cached: bool = False
+        self._output: Context | None = None
+        # set to profile the parse and solution phases of the puzzle input
+        self.profiler: cProfile.Profile | None = None
+        # set to trace allocations of the parse and solution phases of the puzzle input
+        self.trace_memory: bool = False
+        self.memory: dict[str, MemoryStats] = {}
+        self.max_rss: int | None = None
+        # set above 1 to run the test cases in a process pool, eager_input also runs the puzzle input alongside them
+        self.test_workers: int = 1
+        self.eager_input: bool = False
+
+    def identify(self) -> tuple[int, int, int]:
+        # year, day and part, from the class name and the year folder of its module
         if match := re.match(r"Day(\d+)Part(\d+)", self.__class__.__name__):
-            self.day = int(match.group(1))
-            self.part = int(match.group(2))
+            day = int(match.group(1))
+            part = int(match.group(2))
         else:
             raise ValueError("Invalid Class Name")
         file = Path(inspect.getfile(self.__class__))
         year_folder = file.absolute().parent
-        self.year = int(year_folder.name[1:])
-        self._divider_width: int = 42
+        return int(year_folder.name[1:]), day, part
 
     @property
     def name(self) -> str:
@@ -81,16 +171,19 @@ class Puzzle(ABC):
         groups = self.get_input_lines(data)
         return "".join(groups)
 
-    def get_input_grid(self, data: str) -> list[list[str]]:
-        return [list(line) for line in self.get_input_lines(data)]
+    def get_input_grid(self, data: str) -> Grid:
+        return Grid.from_lines(self.get_input_lines(data))
 
-    def get_puzzle_input(self) -> str:
+    def puzzle_input_path(self) -> Path:
         formatted_day = AdventOfCode.formatted_day(self.day)
         formatted_part = AdventOfCode.formatted_part(self.part)
         input_path = self.input_dir.joinpath(f"{formatted_day}{formatted_part}.in")
         if not input_path.exists():
             input_path = self.input_dir.joinpath(f"{formatted_day}.in")
-        return self.get_file_data(input_path)
+        return input_path
+
+    def get_puzzle_input(self) -> str:
+        return self.get_file_data(self.puzzle_input_path())
 
     def create_output_path(self, path: Path | str) -> Path:
         output_path = self.output_dir.joinpath(path)
@@ -110,13 +203,43 @@ class Puzzle(ABC):
         return click.style("=" * width, fg="black", bg="blue")
 
     def echo_divider(self, width: int | None = None) -> None:
-        click.echo(self.create_divider(width))
-
-    def echo(self, *args: Any) -> None:
-        click.echo(" ".join(str(arg) for arg in args))
-
-    def echo_lines(self, lines: list[Any]) -> None:
-        click.echo("\n".join(str(line) for line in lines))
+        self._emit(Verbosity.DEBUG, self.create_divider, width)
+
+    def _emit(self, level: Verbosity, renderer: Callable[..., str], *args: Any) -> None:
+        output = self._output
+        if output is None or output.buffer is None:
+            click.echo(renderer(*args))
+        elif level <= self.capture_verbosity:
+            output.defer(renderer, *args)
+
+    def echo(self, *args: Any, level: Verbosity = Verbosity.DEBUG) -> None:
+        """
+        Callable args are only called when the message is rendered. Captured messages are rendered when flushed,
+        args included, so they show the state at that point. Pass values that change afterwards already rendered
+        (e.g. `str(acc)`) or use TRACE, which is only shown uncaptured and rendered right away.
+        """
+        self._emit(level, render, *args)
+
+    def echo_lines(self, lines: list[Any], level: Verbosity = Verbosity.DEBUG) -> None:
+        self._emit(level, lambda: "\n".join(str(line) for line in lines))
+
+    def log(self, msg: str, *args: Any, level: Verbosity = Verbosity.DEBUG) -> None:
+        # `msg % args`, rendered as lazily as echo: the args are kept by reference until then
+        self._emit(level, render_log, msg, *args)
+
+    @contextmanager
+    def capture_output(self, passthrough: bool, label: str = "") -> Generator["Context", None, None]:
+        spill_path = None
+        if self.capture_spill and not passthrough:
+            spill_path = self.create_output_path("logs").joinpath(f"{self.name.lower()}{label}.log")
+        with capture_output(
+            passthrough, max_lines=self.capture_max_lines, max_chars=self.capture_max_chars, spill_path=spill_path
+        ) as ctx:
+            self._output = ctx
+            try:
+                yield ctx
+            finally:
+                self._output = None
 
     @abstractmethod
     def parse_data(self, data: str) -> None:
@@ -126,32 +249,336 @@ class Puzzle(ABC):
     def solution(self, parsed_data: None) -> None:
         pass
 
+    def source_class(self) -> type:
+        # the class whose source the answer depends on
+        return self.__class__
+
+    def source_files(self) -> list[Path]:
+        """
+        Source files under `src` the puzzle depends on: its class hierarchy plus every module, class or function
+        its module imports from there (e.g. `utils`).
+        """
+        src_dir = self.root_dir.joinpath("src").resolve()
+        cls = self.source_class()
+        module = inspect.getmodule(cls)
+        files = set()
+        for obj in [*cls.__mro__, *vars(module).values()]:
+            obj_module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+            if file := getattr(obj_module, "__file__", None):
+                path = Path(file).resolve()
+                if path.is_relative_to(src_dir):
+                    files.add(path)
+        return sorted(files)
+
+    @classmethod
+    def source_fingerprint(cls) -> str:
+        """
+        Hash of the module source the class depends on, everything except the puzzle classes outside its hierarchy.
+        """
+        import ast
+        import hashlib
+
+        module = inspect.getmodule(cls)
+        source = Path(inspect.getfile(cls)).read_text()
+        digest = hashlib.sha256()
+        for node in ast.parse(source).body:
+            obj = vars(module).get(node.name) if isinstance(node, ast.ClassDef) else None
+            if isinstance(obj, type) and issubclass(obj, Puzzle) and obj not in cls.__mro__:
+                continue
+            digest.update(ast.get_source_segment(source, node).encode())
+        return digest.hexdigest()
+
+    def answer_cache_key(self, tests: list[tuple[str, Any]] | None) -> str:
+        import hashlib
+
+        digest = hashlib.sha256(self.puzzle_input_path().read_bytes())
+        for file in self.source_files():
+            digest.update(file.read_bytes())
+        digest.update(repr(tests or []).encode())
+        return digest.hexdigest()
+
+    def _answer_cache_path(self) -> Path:
+        return self.create_output_path("cache").joinpath(f"{self.name.lower()}.answer")
+
+    def load_cached_answer(self, key: str) -> Any:
+        path = self._answer_cache_path()
+        if not path.exists():
+            return MISSING
+        import pickle
+
+        cached_key, answer = pickle.loads(path.read_bytes())
+        return answer if cached_key == key else MISSING
+
+    def store_cached_answer(self, key: str, answer: Any) -> None:
+        import pickle
+
+        self._answer_cache_path().write_bytes(pickle.dumps((key, answer)))
+
+    def parser_class(self) -> type["Puzzle"]:
+        # the class implementing parse_data, shared by the parts that inherit it
+        return next(cls for cls in self.__class__.__mro__ if "parse_data" in vars(cls))
+
+    def load_parsed_data(self, data: str) -> Any:
+        if self.parse_memo is None:
+            return self._load_parsed_data(data)
+        import hashlib
+        import pickle
+
+        parser = self.parser_class()
+        digest = hashlib.sha256(data.encode())
+        digest.update(parser.source_fingerprint().encode())
+        key = digest.hexdigest()
+        name = f"{parser.__module__}.{parser.__qualname__}"
+        if (memo := self.parse_memo.get(name)) and memo[0] == key:
+            return pickle.loads(memo[1])
+        parsed_data = self._load_parsed_data(data)
+        try:
+            self.parse_memo[name] = (key, pickle.dumps(parsed_data, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            pass
+        return parsed_data
+
+    def _load_parsed_data(self, data: str) -> Any:
+        if self.parse_cache_version is None:
+            return self.parse_data(data)
+        import hashlib
+        import pickle
+
+        # parts sharing a parse_data implementation share the cache entry
+        parser = self.parser_class().__qualname__
+        digest = hashlib.sha256(data.encode())
+        digest.update(f"{parser}:{self.parse_cache_version}".encode())
+        key = digest.hexdigest()
+        path = self.create_output_path("cache").joinpath(f"{AdventOfCode.formatted_day(self.day)}-{parser}.parsed")
+        try:
+            cached_key, parsed_data = pickle.loads(path.read_bytes())
+            if cached_key == key:
+                return parsed_data
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            # unreadable entries are parsed again and replaced
+            pass
+        parsed_data = self.parse_data(data)
+        write_atomic(path, pickle.dumps((key, parsed_data), pickle.HIGHEST_PROTOCOL))
+        return parsed_data
+
     def _check_solution(self, solution: Any, expected: Any) -> bool:
         if solution == expected:
             return True
         click.echo(f"{Color.fail('FAILED!')}\nExpected:\n{expected}\nSolution:\n{solution}")
         return False
 
+    def _timed[T](self, phase: str, func: Callable[..., T], *args: Any) -> T:
+        profiler = self.profiler if phase in PROFILED_PHASES else None
+        tracer = MemoryTracer(func) if self.trace_memory and phase in PROFILED_PHASES else None
+        if tracer:
+            tracer.start()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            return func(*args)
+        finally:
+            if profiler:
+                profiler.disable()
+            self.timings[phase] = time.perf_counter() - start
+            if tracer:
+                self.memory[phase] = tracer.stop()
+                self.max_rss = max_rss()
+
+    def save_profile(self, top: int = 25) -> Path | None:
+        if self.profiler is None or "solution" not in self.timings:
+            return None
+        import pstats
+
+        path = self.create_output_path("profiles").joinpath(f"{self.name.lower()}.pstats")
+        self.profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(str(path), stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        path.with_suffix(".txt").write_text(summary.getvalue())
+        return path
+
+    def run_phases(self, cached_parse: bool = True) -> Any:
+        # profiled, traced and benchmarked runs always measure parse_data itself, never a cache load
+        if self.trace_memory:
+            reset_max_rss()
+        data = self._timed("input", self.get_puzzle_input)
+        if cached_parse and self.profiler is None and not self.trace_memory:
+            parsed_data = self._timed("parse", self.load_parsed_data, data)
+        else:
+            parsed_data = self._timed("parse", self.parse_data, data)
+        return self._timed("solution", self.solution, parsed_data)
+
+    def run_data(self, data: str) -> Any:
+        # timed like run_phases, for input that isn't the puzzle input (e.g. generated), so never cached
+        parsed_data = self._timed("parse", self.parse_data, data)
+        return self._timed("solution", self.solution, parsed_data)
+
+    def strategies(self) -> dict[str, Callable[[Any], Any]]:
+        # solution first, then the methods registered with @strategy
+        found = {"solution": self.solution}
+        for attr in dir(self.__class__):
+            if (name := getattr(getattr(self.__class__, attr), "strategy", None)) is not None:
+                found[name] = getattr(self, attr)
+        return found
+
+    def run_strategies(self, data: str) -> dict[str, Any]:
+        answers = {}
+        for name, func in self.strategies().items():
+            with self.capture_output(False):
+                answers[name] = func(self.parse_data(data))
+        return answers
+
+    def benchmark_strategies(self, warmup: int = 1, repeat: int = 5) -> dict[str, PhaseStats]:
+        # the puzzle input, parsed again for every sample, only the strategy itself is timed
+        data = self.get_puzzle_input()
+        stats = {}
+        for name, func in self.strategies().items():
+            samples = []
+            for i in range(max(warmup, 0) + max(repeat, 1)):
+                parsed_data = self.load_parsed_data(data)
+                with self.capture_output(False):
+                    start = time.perf_counter()
+                    func(parsed_data)
+                    elapsed = time.perf_counter() - start
+                if i >= warmup:
+                    samples.append(elapsed)
+            stats[name] = PhaseStats(name, samples)
+        return stats
+
+    def benchmark(self, warmup: int = 1, repeat: int = 5) -> dict[str, PhaseStats]:
+        # every run re-reads and re-parses, solutions are free to mutate their parsed data
+        samples: dict[str, list[float]] = {phase: [] for phase in PHASES}
+        for i in range(max(warmup, 0) + max(repeat, 1)):
+            with self.capture_output(False):
+                self.answer = self.run_phases(cached_parse=False)
+            if i >= warmup:
+                for phase, elapsed in self.timings.items():
+                    samples[phase].append(elapsed)
+        return {phase: PhaseStats(phase, phase_samples) for phase, phase_samples in samples.items()}
+
     def solve(
-        self, tests: list[tuple[str, Any]] | None = None, *, expected: Any = MISSING, debugging: bool = False
+        self,
+        tests: list[tuple[str, Any]] | None = None,
+        *,
+        expected: Any = MISSING,
+        debugging: bool = False,
+        recompute: bool = False,
     ) -> bool:
-        if self.test(tests, debugging):
+        # answers are cached by input + source, debugging always recomputes so the output can be seen
+        try:
+            cache_key = self.answer_cache_key(tests)
+        except FileNotFoundError:
+            # no puzzle input, the tests still run first and reading the input fails after them
+            cache_key = None
+        if cache_key is not None and not debugging and not recompute:
+            cached_answer = self.load_cached_answer(cache_key)
+            if cached_answer is not MISSING:
+                click.echo(self.create_header("SOLUTION (cached)", True))
+                self.answer = cached_answer
+                self.cached = True
+                if expected is not MISSING and not self._check_solution(cached_answer, expected):
+                    return False
+                click.echo(cached_answer)
+                return True
+
+        if self.eager_input and self._concurrent(debugging):
+            results = self._run_cases(self._test_cases(tests) + [(None, None, expected)])
+            if not self._report_cases(results, len(tests or ())):
+                return False
             click.echo(self.create_header("SOLUTION", True))
-            with capture_output(debugging) as ctx:
-                solution = self.solution(self.parse_data(self.get_puzzle_input()))
-                if expected is not MISSING and not self._check_solution(solution, expected):
+            result = results[None]
+            self.answer = result.solution
+            self.timings = dict(result.timings)
+            if not self._report_case(result):
+                return False
+        elif self.test(tests, debugging):
+            click.echo(self.create_header("SOLUTION", True))
+            with self.capture_output(debugging) as ctx:
+                self.answer = self.run_phases()
+                if expected is not MISSING and not self._check_solution(self.answer, expected):
                     ctx.flush = True
                     return False
-            click.echo(solution)
+        else:
+            return False
+        if cache_key is not None:
+            self.store_cached_answer(cache_key, self.answer)
+        click.echo(self.answer)
+        return True
+
+    def _concurrent(self, debugging: bool) -> bool:
+        # debugging output would interleave, pool workers (batch runs) can't start processes of their own and profiling
+        # and tracing only work in this process
+        if self.test_workers <= 1 or debugging or self.profiler is not None or self.trace_memory:
+            return False
+        import multiprocessing
+
+        return not multiprocessing.current_process().daemon
+
+    def _test_cases(self, tests: list[tuple[str, Any]] | None) -> list[tuple[int | None, str | None, Any]]:
+        return [(i, data, expected) for i, (data, expected) in enumerate(tests or ())]
+
+    def _run_case(self, index: int | None, data: str | None, expected: Any) -> CaseResult:
+        # runs in a pool worker, the captured output is handed back instead of flushed
+        solution = MISSING
+        error = None
+        with self.capture_output(False, "" if index is None else f"-test{index}") as ctx:
+            try:
+                if index is None:
+                    solution = self.run_phases()
+                else:
+                    click.echo(self.create_header(f"TEST {index}", True))
+                    solution = self.solution(self.parse_data(data))
+                passed = expected is MISSING or self._check_solution(solution, expected)
+            except Exception as ex:
+                click.echo(traceback.format_exc(), nl=False)
+                passed = False
+                error = ex
+            output = ctx.getvalue()
+        return CaseResult(index, passed, solution, self.timings, output, error)
+
+    def _run_cases(self, cases: list[tuple[int | None, str | None, Any]]) -> dict[int | None, CaseResult]:
+        """
+        Runs the cases in a process pool. Returns as soon as one of them fails, the unfinished ones are terminated.
+        """
+        import multiprocessing
+        import queue
+
+        finished: queue.SimpleQueue[CaseResult | BaseException] = queue.SimpleQueue()
+        results = {}
+        with multiprocessing.Pool(min(self.test_workers, len(cases))) as pool:
+            for case in cases:
+                pool.apply_async(self._run_case, case, callback=finished.put, error_callback=finished.put)
+            while len(results) < len(cases):
+                result = finished.get()
+                if isinstance(result, BaseException):
+                    raise result
+                results[result.index] = result
+                if not result.passed:
+                    break
+        return results
+
+    def _report_case(self, result: CaseResult) -> bool:
+        if result.passed:
             return True
+        click.echo(result.output, nl=False)
+        if result.error is not None:
+            raise result.error
         return False
 
+    def _report_cases(self, results: dict[int | None, CaseResult], count: int) -> bool:
+        # in order, so the first failing test is the one reported
+        return all(self._report_case(results[i]) for i in range(count) if i in results)
+
     def test(self, tests: list[tuple[str, Any]] | None, debugging: bool = False) -> bool:
         if not tests:
             return True
+        if self._concurrent(debugging):
+            return self._report_cases(self._run_cases(self._test_cases(tests)), len(tests))
 
         for i, (data, expected) in enumerate(tests):
-            with capture_output(debugging) as ctx:
+            with self.capture_output(debugging, f"-test{i}") as ctx:
                 click.echo(self.create_header(f"TEST {i}", True))
                 solution = self.solution(self.parse_data(data))
                 if not self._check_solution(solution, expected):
@@ -161,17 +588,112 @@ class Puzzle(ABC):
         return True
 
 
+def write_atomic(path: Path, data: bytes) -> None:
+    # parallel runs (e.g. parts sharing a parser in batch) never see a partially written file
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as f:
+        f.write(data)
+    os.replace(f.name, path)
+
+
+type Deferred = tuple[Callable[..., str], tuple[Any, ...]]
+
+
+class CaptureBuffer(io.TextIOBase):
+    """
+    Keeps the last `max_lines` lines (and at most `max_chars` characters) of the captured output.
+    Deferred messages count as a line and are only rendered by getvalue, unless the full log is spilled to a file.
+    """
+
+    def __init__(self, max_lines: int | None = None, max_chars: int | None = None, spill_path: Path | None = None):
+        super().__init__()
+        self.max_lines = max_lines
+        self.max_chars = max_chars
+        self.spill_path = spill_path
+        self.spill = spill_path.open("w") if spill_path else None
+        self.entries: deque[str | Deferred] = deque()
+        self.chars = 0
+        self.dropped = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if not isinstance(s, str):
+            # click probes for a binary writer, it has to fall back to text
+            raise TypeError(f"string argument expected, got {type(s).__name__}")
+        if self.spill:
+            self.spill.write(s)
+        for line in s.splitlines(keepends=True):
+            if self.entries and isinstance(last := self.entries[-1], str) and not last.endswith("\n"):
+                self.entries.pop()
+                self.chars -= len(last)
+                line = last + line
+            self._append(line)
+        return len(s)
+
+    def defer(self, renderer: Callable[..., str], *args: Any) -> None:
+        if self.spill:
+            self.write(f"{renderer(*args)}\n")
+        else:
+            self._append((renderer, args))
+
+    def _append(self, entry: str | Deferred) -> None:
+        self.entries.append(entry)
+        if isinstance(entry, str):
+            self.chars += len(entry)
+        while len(self.entries) > 1 and (
+            (self.max_lines is not None and len(self.entries) > self.max_lines)
+            or (self.max_chars is not None and self.chars > self.max_chars)
+        ):
+            dropped = self.entries.popleft()
+            if isinstance(dropped, str):
+                self.chars -= len(dropped)
+            self.dropped += 1
+
+    def getvalue(self) -> str:
+        chunks = []
+        if self.dropped:
+            full_log = f", full log in {self.spill_path}" if self.spill_path else ""
+            chunks.append(Color.info(f"... {self.dropped} lines dropped{full_log}\n"))
+        for entry in self.entries:
+            if isinstance(entry, str):
+                chunks.append(entry)
+            else:
+                renderer, args = entry
+                chunks.append(f"{renderer(*args)}\n")
+        return "".join(chunks)
+
+    def close(self) -> None:
+        if self.spill:
+            self.spill.close()
+        super().close()
+
+
 class Context:
-    def __init__(self) -> None:
+    def __init__(self, buffer: CaptureBuffer | None = None) -> None:
         self.flush: bool = False
+        self.buffer = buffer
 
+    def defer(self, renderer: Callable[..., str], *args: Any) -> None:
+        # only rendered if the output gets flushed
+        self.buffer.defer(renderer, *args)
+
+    def getvalue(self) -> str:
+        return self.buffer.getvalue()
 
-@contextmanager
-def capture_output(passthrough: bool) -> Generator[Context, None, None]:
-    ctx = Context()
 
+@contextmanager
+def capture_output(
+    passthrough: bool,
+    *,
+    max_lines: int | None = None,
+    max_chars: int | None = None,
+    spill_path: Path | None = None,
+) -> Generator[Context, None, None]:
     if passthrough:
-        yield ctx
+        yield Context()
         return
 
     orig_echo = click.echo
@@ -192,7 +714,8 @@ def capture_output(passthrough: bool) -> Generator[Context, None, None]:
     click.echo = patched_echo
     click.secho = patched_secho
 
-    buffer = io.StringIO()
+    buffer = CaptureBuffer(max_lines, max_chars, spill_path)
+    ctx = Context(buffer)
 
     try:
         with redirect_stdout(buffer), redirect_stderr(buffer):
@@ -204,4 +727,5 @@ def capture_output(passthrough: bool) -> Generator[Context, None, None]:
         click.echo = orig_echo
         click.secho = orig_secho
         if ctx.flush:
-            click.echo(buffer.getvalue(), nl=False)
+            click.echo(ctx.getvalue(), nl=False)
+        buffer.close()
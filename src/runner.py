@@ -1,12 +1,290 @@
+import cProfile
 import importlib
+import inspect
+import io
+import multiprocessing
+import os
+import re
+import runpy
+import signal
+import sys
+import time
+import traceback
+from collections import deque
+from collections.abc import Generator
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from functools import cache
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait
+from pathlib import Path
+from types import ModuleType
 from typing import Any
+from typing import NamedTuple
 
+import click
+from bench import append_history
+from bench import create_records
+from bench import format_bytes
+from bench import MemoryStats
+from bench import PhaseStats
+from puzzle import Puzzle
+from utils import Color
+from utils import create_banner
 from utils import MISSING
+from utils import root_dir
 
 from aoc import AdventOfCode
 
+try:
+    import resource
+except ImportError:  # windows, limits other than the wall time are ignored
+    resource = None
+
+
+# imported once by the fork server (see warm_context) and the daemon
+PRELOAD_MODULES = ("click", "aoc", "utils", "bench", "puzzle", "runner")
+# preloaded by the daemon and batch runs, the day modules themselves only import them lazily
+HEAVY_MODULES = ("shapely", "PIL.Image", "PIL.ImageDraw", "PIL.ImageFont")
+
+
+class Status(Enum):
+    PASSED = "PASS"
+    FAILED = "FAIL"
+    ERROR = "ERROR"
+    TIMEOUT = "TIME"
+    LIMIT = "LIMIT"
+    CRASHED = "CRASH"
+    UNCONFIRMED = "DONE"
+
+    @property
+    def ok(self) -> bool:
+        return self in (Status.PASSED, Status.UNCONFIRMED)
+
+    def styled(self, width: int = 0) -> str:
+        text = f"{self.value:<{width}}"
+        if self is Status.PASSED:
+            return Color.success(text)
+        if self is Status.UNCONFIRMED:
+            return Color.info(text)
+        return Color.fail(text)
+
+
+class PartTask(NamedTuple):
+    year: int
+    day: int
+    part: int
+    tests: list[tuple[str, Any]]
+    expected: Any = MISSING
+
+    @property
+    def name(self) -> str:
+        return f"Y{self.year:04}D{self.day:02}P{self.part:02}"
+
+
+class Limits(NamedTuple):
+    wall: float | None = None
+    # seconds of cpu time
+    cpu: int | None = None
+    # bytes of address space
+    memory: int | None = None
+
+    def apply(self) -> None:
+        if resource is None:
+            return
+        if self.cpu is not None:
+            # the soft limit raises SIGXCPU, the hard limit is only a backstop
+            resource.setrlimit(resource.RLIMIT_CPU, (self.cpu, self.cpu + 1))
+        if self.memory is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (self.memory, self.memory))
+
+
+class RunOptions(NamedTuple):
+    debugging: bool = False
+    recompute: bool = False
+    profile: bool = False
+    memory: bool = False
+    # runs every part in its own process when set, batch runs always do
+    limits: Limits | None = None
+    # runs the test cases in a process pool, eager_input also runs the puzzle input alongside them
+    test_workers: int = 1
+    eager_input: bool = False
+
+
+@dataclass
+class PartResult:
+    year: int
+    day: int
+    part: int
+    status: Status
+    answer: Any = MISSING
+    elapsed: float = 0.0
+    timings: dict[str, float] = field(default_factory=dict)
+    cached: bool = False
+    memory: dict[str, MemoryStats] = field(default_factory=dict)
+    max_rss: int | None = None
+    output: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"Y{self.year:04}D{self.day:02}P{self.part:02}"
+
+
+def import_puzzle_module(year: int, day: int) -> ModuleType:
+    return importlib.import_module(AdventOfCode.puzzle_module(year, day))
+
+
+def puzzle_modules(years: list[int] | None = None, days: list[int] | None = None) -> list[str]:
+    # every yYYYY/dXX*.py module, including the standalone 2024 ones
+    modules = []
+    for path in sorted(root_dir().joinpath("src").glob("y[0-9][0-9][0-9][0-9]/d*.py")):
+        year = int(path.parent.name[1:])
+        if match := re.match(r"d(\d+)", path.stem):
+            if (not years or year in years) and (not days or int(match.group(1)) in days):
+                modules.append(f"{path.parent.name}.{path.stem}")
+    return modules
+
+
+def puzzle_parts(module: ModuleType, day: int) -> list[int]:
+    parts = []
+    for name, obj in inspect.getmembers(module, inspect.isclass):
+        if not issubclass(obj, Puzzle) or inspect.isabstract(obj):
+            continue
+        if match := re.fullmatch(rf"Day{day}Part(\d+)", name):
+            parts.append(int(match.group(1)))
+    return sorted(parts)
+
+
+def part_module(year: int, day: int, part: int) -> str:
+    # the day module, or the standalone 2024 part module when the day has none
+    module_name = AdventOfCode.puzzle_module(year, day)
+    if root_dir().joinpath("src", *module_name.split(".")).with_suffix(".py").exists():
+        return module_name
+    return f"{module_name}p{part}"
+
+
+def standalone_day(year: int, day: int) -> bool:
+    return part_module(year, day, 0) != AdventOfCode.puzzle_module(year, day)
+
+
+def part_class(year: int, day: int, part: int) -> type:
+    # the Puzzle subclass, or the class of a standalone 2024 part module
+    module = importlib.import_module(part_module(year, day, part))
+    return getattr(module, AdventOfCode.puzzle_class(day, part))
+
+
+def create_part(year: int, day: int, part: int) -> Any:
+    return part_class(year, day, part)()
+
+
+def solve_data(part: Any, data: str) -> tuple[Any, dict[str, float]]:
+    if isinstance(part, Puzzle):
+        with part.capture_output(False):
+            answer = part.run_data(data)
+        return answer, dict(part.timings)
+    # standalone parts take the raw input and print as they please
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        answer = part.solution(data.strip())
+        elapsed = time.perf_counter() - start
+    return answer, {"solution": elapsed}
+
+
+def standalone_tests(cls: type) -> list[tuple[str, Any]] | None:
+    """
+    The examples of a standalone part from its `__test__` (a single example or lists of them). None if the part can't
+    be run on raw input, e.g. the early days reading their input themselves.
+    """
+    solution = getattr(cls, "solution", None)
+    if solution is None or list(inspect.signature(solution).parameters)[1:2] != ["data"]:
+        return None
+    config = getattr(cls, "__test__", None)
+    if not config:
+        return []
+    if isinstance(config["data"], str):
+        return [(config["data"], config["expected"])]
+    return list(zip(config["data"], config["expected"]))
+
+
+class StandalonePart(Puzzle):
+    """
+    A standalone 2024 part run as a Puzzle, so it gets the same tests, profiling and memory tracing. Its
+    `solution(data)` takes the stripped raw input, which makes stripping the whole parse phase.
+    """
+
+    def __init__(self, year: int, day: int, part: int) -> None:
+        self.standalone = part_class(year, day, part)()
+        self.identity = year, day, part
+        super().__init__()
+        # timed, profiled and traced as the part's own solution, its locals are what memory tracing has to see
+        self.solution = self.standalone.solution
+
+    def identify(self) -> tuple[int, int, int]:
+        return self.identity
+
+    def parse_data(self, data: str) -> str:
+        return data.strip()
+
+    def solution(self, parsed_data: str) -> Any:
+        return self.standalone.solution(parsed_data)
+
+    def source_class(self) -> type:
+        # answers are cached by the part module, not this one
+        return self.standalone.__class__
+
+
+def create_puzzle(year: int, day: int, part: int) -> Puzzle:
+    cls = part_class(year, day, part)
+    return cls() if issubclass(cls, Puzzle) else StandalonePart(year, day, part)
+
+
+def run_task(task: PartTask, options: RunOptions = RunOptions()) -> PartResult:
+    puzzle = create_puzzle(task.year, task.day, task.part)
+    if options.profile:
+        puzzle.profiler = cProfile.Profile()
+    puzzle.trace_memory = options.memory
+    puzzle.test_workers = options.test_workers
+    puzzle.eager_input = options.eager_input
+    # a cached answer has nothing to profile or trace
+    recompute = options.recompute or options.profile or options.memory
+    start = time.perf_counter()
+    passed = puzzle.solve(list(task.tests), expected=task.expected, debugging=options.debugging, recompute=recompute)
+    elapsed = time.perf_counter() - start
+    if options.profile and (path := puzzle.save_profile()):
+        click.echo(f"Profile saved to {path}")
+    for phase, stats in puzzle.memory.items():
+        click.echo(f"{phase} {stats}")
+    if puzzle.max_rss is not None:
+        click.echo(f"max rss={format_bytes(puzzle.max_rss)}")
+    if not passed:
+        status = Status.FAILED
+    elif task.expected is MISSING:
+        status = Status.UNCONFIRMED
+    else:
+        status = Status.PASSED
+    return PartResult(
+        task.year,
+        task.day,
+        task.part,
+        status,
+        puzzle.answer,
+        elapsed,
+        dict(puzzle.timings),
+        puzzle.cached,
+        dict(puzzle.memory),
+        puzzle.max_rss,
+    )
+
 
 class Runner:
+    # when set, run() registers the runner here instead of running it (see collect_runners)
+    _collected: list["Runner"] | None = None
+
     def __init__(self, year: int, day: int, parts: int) -> None:
         self.year = year
         self.day = day
@@ -14,7 +292,6 @@ class Runner:
         self.runnable: dict[int, bool] = {}
         self.tests: dict[int, list[tuple[str, Any]]] = {}
         self.solutions: dict[int, Any] = {}
-        self.module = importlib.import_module(AdventOfCode.puzzle_module(self.year, self.day))
 
     def add_test(self, part: int, data: str, expected: Any) -> None:
         self.tests.setdefault(part, []).append((data, expected))
@@ -30,23 +307,385 @@ class Runner:
     def disable(self, part: int) -> None:
         self.runnable[part] = False
 
-    def run(self, part: int | None = None, *, debugging: bool = False) -> None:
-        if part is None:
-            start = 1
-            end = self.parts + 1
-        else:
-            start = part
-            end = start + 1
+    def runnable_parts(self, part: int | None = None) -> list[int]:
+        parts = range(1, self.parts + 1) if part is None else [part]
+        return [p for p in parts if self.runnable.get(p, False)]
 
-        for part in range(start, end):
-            if not self.runnable.get(part, False):
-                continue
-            puzzle_class = getattr(self.module, AdventOfCode.puzzle_class(self.day, part))
-            puzzle = puzzle_class()
-            tests = self.tests.get(part, [])
-            if not puzzle.solve(tests, expected=self.solutions.get(part, MISSING), debugging=debugging):
+    def task(self, part: int) -> PartTask:
+        return PartTask(self.year, self.day, part, self.tests.get(part, []), self.solutions.get(part, MISSING))
+
+    def run(
+        self,
+        part: int | None = None,
+        *,
+        debugging: bool = False,
+        recompute: bool = False,
+        profile: bool = False,
+        memory: bool = False,
+        limits: Limits | None = None,
+        test_workers: int = 1,
+        eager_input: bool = False,
+    ) -> list[PartResult]:
+        if Runner._collected is not None:
+            Runner._collected.append(self)
+            return []
+
+        options = RunOptions(debugging, recompute, profile, memory, limits, test_workers, eager_input)
+        results = []
+        for part in self.runnable_parts(part):
+            if limits is None:
+                result = run_task(self.task(part), options)
+            else:
+                result = run_isolated(self.task(part), options, keep_output=True)
+                click.echo(result.output, nl=False)
+                if not result.status.ok:
+                    click.echo(Color.fail(f"{result.name} - {result.status.value}"))
+            results.append(result)
+            if result.status is Status.FAILED:
                 break
+        return results
+
+    def benchmark(
+        self,
+        part: int | None = None,
+        *,
+        warmup: int = 1,
+        repeat: int = 5,
+        memory: bool = False,
+        record: bool = False,
+    ) -> dict[int, dict[str, PhaseStats]]:
+        results = {}
+        for part in self.runnable_parts(part):
+            puzzle = create_puzzle(self.year, self.day, part)
+            click.echo(puzzle.create_header(f"BENCHMARK (warmup={warmup}, repeat={repeat})"))
+            stats = puzzle.benchmark(warmup, repeat)
+            for phase_stats in stats.values():
+                click.echo(phase_stats)
+            if memory:
+                # separate run, tracing would skew the timings
+                puzzle.trace_memory = True
+                with puzzle.capture_output(False):
+                    puzzle.run_phases()
+                for phase, memory_stats in puzzle.memory.items():
+                    click.echo(f"{phase} peak={format_bytes(memory_stats.peak)}")
+            expected = self.solutions.get(part, MISSING)
+            if expected is not MISSING and puzzle.answer != expected:
+                click.echo(Color.fail(f"answer {puzzle.answer} != expected {expected}"))
+            elif record:
+                append_history(create_records(self.year, self.day, part, stats, puzzle.memory))
+            results[part] = stats
+        return results
+
+    def compare(self, part: int | None = None, *, warmup: int = 1, repeat: int = 5) -> bool:
+        """
+        Checks that every strategy of a part (see `puzzle.strategy`) agrees on the tests and the puzzle input, then
+        benchmarks them side by side. Without an expected answer the strategies have to agree with `solution`.
+        """
+        agreed = True
+        for part in self.runnable_parts(part):
+            puzzle = create_puzzle(self.year, self.day, part)
+            if len(puzzle.strategies()) == 1:
+                click.echo(f"{puzzle.full_name} only has a solution")
+                continue
+            click.echo(puzzle.create_header("STRATEGIES"))
+            cases = [(f"TEST {i}", data, expected) for i, (data, expected) in enumerate(self.tests.get(part, []))]
+            cases.append(("INPUT", puzzle.get_puzzle_input(), self.solutions.get(part, MISSING)))
+            part_agreed = True
+            for label, data, expected in cases:
+                answers = puzzle.run_strategies(data)
+                reference = answers["solution"] if expected is MISSING else expected
+                ok = all(answer == reference for answer in answers.values())
+                part_agreed &= ok
+                status = Status.PASSED if ok else Status.FAILED
+                click.echo(f"{label:<8} {status.styled()} {', '.join(f'{k}={v}' for k, v in answers.items())}")
+            agreed &= part_agreed
+            if not part_agreed:
+                continue
+            stats = puzzle.benchmark_strategies(warmup, repeat)
+            fastest = min(strategy_stats.median for strategy_stats in stats.values())
+            for strategy_stats in stats.values():
+                click.echo(f"{strategy_stats} x{strategy_stats.median / fastest:.1f}")
+        return agreed
+
+
+@contextmanager
+def collect_runners() -> Generator[list[Runner], None, None]:
+    runners: list[Runner] = []
+    Runner._collected = runners
+    try:
+        yield runners
+    finally:
+        Runner._collected = None
+
+
+def runner_script_path(year: int, day: int) -> Path:
+    year_pkg = AdventOfCode.formatted_year(year)
+    return root_dir().joinpath("io", year_pkg, "runner", f"runner_{AdventOfCode.formatted_day(day)}.py")
+
+
+def load_runner(year: int, day: int) -> Runner:
+    """
+    Builds the runner for a day from its io runner script, so tests and confirmed solutions are reused as is.
+    Days without a script get every part enabled, with no tests and no expected answer. Standalone 2024 parts get their
+    `__test__` examples, the ones that can't run on raw input stay disabled.
+    """
+    script = runner_script_path(year, day)
+    if script.exists():
+        with collect_runners() as runners:
+            runpy.run_path(str(script), run_name="__main__")
+        for runner in runners:
+            if runner.year == year and runner.day == day:
+                return runner
+
+    if standalone_day(year, day):
+        parts = [int(module.rsplit("p", 1)[1]) for module in puzzle_modules([year], [day])]
+        runner = Runner(year, day, max(parts, default=0))
+        for part in parts:
+            if (tests := standalone_tests(part_class(year, day, part))) is not None:
+                runner.tests[part] = tests
+                runner.enable(part)
+        return runner
+
+    module = import_puzzle_module(year, day)
+    parts = puzzle_parts(module, day)
+    runner = Runner(year, day, max(parts, default=0))
+    for part in parts:
+        runner.enable(part)
+    return runner
+
+
+def _walk_task(task: PartTask, options: RunOptions, keep_output: bool = False) -> PartResult:
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            result = run_task(task, options)
+    except Exception as ex:
+        status = Status.LIMIT if isinstance(ex, MemoryError) else Status.ERROR
+        result = PartResult(task.year, task.day, task.part, status, elapsed=time.perf_counter() - start)
+        buffer.write(traceback.format_exc())
+    if keep_output or not result.status.ok:
+        result.output = buffer.getvalue()
+    return result
+
+
+def _isolated_task(connection: Connection, task: PartTask, options: RunOptions, keep_output: bool) -> None:
+    if options.limits is not None:
+        options.limits.apply()
+    connection.send(_walk_task(task, options, keep_output))
+    connection.close()
+
+
+class IsolatedRun:
+    """
+    A task running in a child process under `options.limits`. Hitting a limit or crashing the interpreter is reported
+    as a result instead of taking the caller down.
+    """
+
+    def __init__(self, task: PartTask, options: RunOptions, keep_output: bool = False) -> None:
+        self.task = task
+        self.limits = options.limits or Limits()
+        context = warm_context()
+        self.receiver, sender = context.Pipe(duplex=False)
+        self.process = context.Process(target=_isolated_task, args=(sender, task, options, keep_output))
+        self.start = time.perf_counter()
+        self.process.start()
+        sender.close()
+
+    @property
+    def deadline(self) -> float | None:
+        return None if self.limits.wall is None else self.start + self.limits.wall
+
+    @property
+    def handles(self) -> list[Any]:
+        # forked siblings can hold on to the sender, so wait on the process too instead of relying on EOF
+        return [self.receiver, self.process.sentinel]
+
+    def finish(self, timed_out: bool) -> PartResult:
+        # once one of the handles is ready or the deadline passed
+        result = None
+        if not timed_out and self.receiver.poll(0):
+            try:
+                result = self.receiver.recv()
+            except EOFError:
+                pass
+        elapsed = time.perf_counter() - self.start
+        if timed_out:
+            self.process.kill()
+        self.process.join()
+        self.receiver.close()
+
+        if result is not None:
+            return result
+        task, limits = self.task, self.limits
+        if timed_out:
+            status, output = Status.TIMEOUT, f"wall time limit of {limits.wall}s exceeded"
+        elif self.process.exitcode == -getattr(signal, "SIGXCPU", 0):
+            status, output = Status.LIMIT, f"cpu time limit of {limits.cpu}s exceeded"
+        else:
+            status, output = Status.CRASHED, f"process exited with code {self.process.exitcode}"
+        return PartResult(task.year, task.day, task.part, status, elapsed=elapsed, output=f"{output}\n")
+
+
+def run_isolated(task: PartTask, options: RunOptions, keep_output: bool = False) -> PartResult:
+    run = IsolatedRun(task, options, keep_output)
+    return run.finish(timed_out=not wait(run.handles, run.limits.wall))
+
+
+def run_isolated_all(tasks: list[PartTask], options: RunOptions, workers: int) -> Iterator[PartResult]:
+    """
+    Runs the tasks like run_isolated, at most `workers` at a time, yielding the results as they finish. Every process
+    is started from the calling thread: a fork while other threads run can leave the child stuck on a lock one of them
+    held (imports, logging, stdout).
+    """
+    pending = deque(tasks)
+    running: list[IsolatedRun] = []
+    while pending or running:
+        while pending and len(running) < workers:
+            running.append(IsolatedRun(pending.popleft(), options))
+        deadlines = [run.deadline for run in running if run.deadline is not None]
+        timeout = max(min(deadlines) - time.perf_counter(), 0) if deadlines else None
+        ready = wait([handle for run in running for handle in run.handles], timeout)
+        now = time.perf_counter()
+        for run in list(running):
+            if any(handle in ready for handle in run.handles):
+                running.remove(run)
+                yield run.finish(timed_out=False)
+            elif run.deadline is not None and now >= run.deadline:
+                running.remove(run)
+                yield run.finish(timed_out=True)
+
+
+@cache
+def warm_context() -> multiprocessing.context.BaseContext:
+    """
+    Context for worker processes that start with the framework and the day modules already imported. On linux they
+    fork from the parent, which imported whatever got preloaded. Elsewhere a fork server imports
+    `PRELOAD_MODULES` (plus whatever gets preloaded) once and forks them from there, spawning is the last resort.
+    """
+    start_methods = multiprocessing.get_all_start_methods()
+    if sys.platform == "linux" and "fork" in start_methods:
+        return multiprocessing.get_context("fork")
+    if "forkserver" not in start_methods:
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(list(PRELOAD_MODULES))
+    return context
+
+
+def preload(*modules: str) -> None:
+    # imported here when workers fork from this process, the fork server only takes them until it starts (on first use)
+    context = warm_context()
+    if context.get_start_method() == "forkserver":
+        context.set_forkserver_preload([*PRELOAD_MODULES, *modules])
+    elif context.get_start_method() == "fork":
+        for name in modules:
+            # a module failing here fails again in the workers that need it, which report it
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+
+class Daywalker:
+    """
+    Runs every part of every day (optionally filtered by year/day) in its own `warm_context` process, `workers` at a
+    time, and reports the results.
+    Days with a `yYYYY/dXX.py` module run like their runner script, the standalone 2024 `dXXpY.py` parts run their
+    `__test__` examples and then the puzzle input. Parts that can't run on raw input are reported as not covered.
+    """
+
+    def __init__(
+        self,
+        years: list[int] | None = None,
+        days: list[int] | None = None,
+        workers: int | None = None,
+        options: RunOptions = RunOptions(),
+    ):
+        self.years = years or []
+        self.days = days or []
+        self.workers = workers or os.cpu_count() or 1
+        self.options = options
+        # filled in by tasks: standalone parts that can't be run, and the parts of days that failed to load
+        self.uncovered: list[str] = []
+        self.broken: list[PartResult] = []
+
+    def discover_years(self) -> list[int]:
+        years = []
+        for entry in root_dir().joinpath("src").iterdir():
+            if entry.is_dir() and (match := re.fullmatch(r"y(\d{4})", entry.name)):
+                years.append(int(match.group(1)))
+        return sorted(year for year in years if not self.years or year in self.years)
+
+    def discover_days(self, year: int) -> list[int]:
+        return sorted({int(module.split(".")[1][1:3]) for module in puzzle_modules([year], self.days)})
+
+    def day_tasks(self, year: int, day: int) -> list[PartTask]:
+        runner = load_runner(year, day)
+        if standalone_day(year, day):
+            parts = range(1, runner.parts + 1)
+            self.uncovered.extend(runner.task(part).name for part in parts if part not in runner.runnable_parts())
+        return [runner.task(part) for part in runner.runnable_parts()]
+
+    def broken_day(self, year: int, day: int, output: str) -> list[PartResult]:
+        # the day can't be imported, its parts are read from the source instead
+        parts = set()
+        for module in puzzle_modules([year], [day]):
+            source = root_dir().joinpath("src", *module.split(".")).with_suffix(".py").read_text()
+            parts.update(int(part) for part in re.findall(rf"class Day{day}Part(\d+)\b", source))
+        results = [PartResult(year, day, part, Status.ERROR) for part in sorted(parts or {0})]
+        results[0].output = output
+        return results
+
+    def tasks(self) -> list[PartTask]:
+        self.uncovered = []
+        self.broken = []
+        tasks = []
+        for year in self.discover_years():
+            for day in self.discover_days(year):
+                # a day module or runner script raising on import only takes its own parts down
+                try:
+                    tasks.extend(self.day_tasks(year, day))
+                except Exception:
+                    self.broken.extend(self.broken_day(year, day, traceback.format_exc()))
+        return tasks
+
+    def run(self) -> list[PartResult]:
+        tasks = self.tasks()
+        start = time.perf_counter()
+        # imported once up front, the day modules only import the heavy dependencies lazily
+        preload(*HEAVY_MODULES, *sorted({part_module(task.year, task.day, task.part) for task in tasks}))
+        # a fresh fork per part, forking is far cheaper than any import and no module state carries over between parts
+        results = [*self.broken, *run_isolated_all(tasks, self.options, self.workers)]
+        elapsed = time.perf_counter() - start
+        results.sort(key=lambda r: (r.year, r.day, r.part))
+        self.report(results, elapsed)
+        return results
+
+    def report(self, results: list[PartResult], elapsed: float) -> None:
+        for result in results:
+            if result.output:
+                click.echo(create_banner(f"{result.name} - {result.status.value}"))
+                click.echo(result.output, nl=False)
 
+        name_width = max([len(result.name) for result in results], default=0)
+        for result in results:
+            answer = "" if result.answer is MISSING else result.answer
+            cached = "*" if result.cached else " "
+            memory = ""
+            if self.options.memory:
+                peaks = [f"{phase}={format_bytes(stats.peak)}" for phase, stats in result.memory.items()]
+                rss = "" if result.max_rss is None else f"rss={format_bytes(result.max_rss)}"
+                memory = f"{' '.join([*peaks, rss]):<50} "
+            click.echo(
+                f"{result.name:<{name_width}} {result.status.styled(5)} {result.elapsed:>9.3f}s{cached} {memory}{answer}"
+            )
 
-class Daywalker(Runner):
-    pass
+        failed = sum(1 for result in results if not result.status.ok)
+        summary = Color.success("ALL OK") if failed == 0 else Color.fail(f"{failed} NOT OK")
+        total = sum(result.elapsed for result in results)
+        click.echo(f"{len(results)} parts, {summary} in {elapsed:.3f}s (serial {total:.3f}s, {self.workers} workers)")
+        if self.uncovered:
+            click.echo(Color.info(f"not covered, no solution(data) to run: {', '.join(self.uncovered)}"))
+        if any(result.cached for result in results):
+            click.echo("* cached answer, use --recompute to solve again")
@@ -0,0 +1,103 @@
+# Runs a part on generated inputs of increasing size. A day opts in with a module level
+# `generate_input(scale: int, rng: random.Random) -> str`, scale 1 being about the size of a real input and scale s about
+# s times as many items (cells, points, digits). The standalone 2024 parts share the generator of the first part module
+# of the day defining one.
+import importlib
+import math
+import random
+from collections.abc import Callable
+from collections.abc import Iterator
+from typing import Any
+from typing import NamedTuple
+
+from runner import create_part
+from runner import puzzle_modules
+from runner import solve_data
+
+type Generator = Callable[[int, random.Random], str]
+
+# from best to worst
+COMPLEXITIES: dict[str, Callable[[float], float]] = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log(n),
+    "n^2": lambda n: n**2,
+    "n^3": lambda n: n**3,
+}
+
+
+class StressPoint(NamedTuple):
+    scale: int
+    # characters of generated input
+    size: int
+    answer: Any
+    timings: dict[str, float]
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+
+class ComplexityFit(NamedTuple):
+    phase: str
+    # slope of the timings on a log-log scale
+    exponent: float
+    complexity: str
+
+    def __str__(self) -> str:
+        return f"{self.phase}: O({self.complexity}), exponent {self.exponent:.2f}"
+
+    def worse_than(self, complexity: str) -> bool:
+        return list(COMPLEXITIES).index(self.complexity) > list(COMPLEXITIES).index(complexity)
+
+
+def find_generator(year: int, day: int) -> Generator | None:
+    for module_name in puzzle_modules([year], [day]):
+        if generator := getattr(importlib.import_module(module_name), "generate_input", None):
+            return generator
+    return None
+
+
+def stress(
+    year: int, day: int, part: int, scales: list[int], seed: int = 0, budget: float | None = None, repeat: int = 1
+) -> Iterator[StressPoint]:
+    """
+    Yields a point per scale, every scale gets the same seed. Keeps the fastest of `repeat` runs per phase and stops
+    after the first scale slower than `budget` seconds.
+    """
+    generator = find_generator(year, day)
+    if generator is None:
+        raise LookupError(f"Day {day} of {year} has no generate_input")
+    for scale in scales:
+        data = generator(scale, random.Random(seed))
+        timings: dict[str, float] = {}
+        for _ in range(repeat):
+            answer, run_timings = solve_data(create_part(year, day, part), data)
+            timings = {phase: min(elapsed, timings.get(phase, elapsed)) for phase, elapsed in run_timings.items()}
+        point = StressPoint(scale, len(data), answer, timings)
+        yield point
+        if budget is not None and point.total > budget:
+            break
+
+
+def fit_complexity(points: list[StressPoint], phase: str) -> ComplexityFit | None:
+    """
+    Least squares fit of log(time) against log(n) for the exponent, the complexity is the class whose ratio to the
+    timings varies the least. n is the scale times the size of a scale 1 input, the generators scale the number of
+    items while the size can have a fixed part (e.g. the rules of 2024 day 5). None with fewer than two scales.
+    """
+    unit = points[0].size / points[0].scale if points else 0
+    samples = [(point.scale * unit, point.timings[phase]) for point in points if point.timings.get(phase, 0) > 0]
+    if len({n for n, _ in samples}) < 2:
+        return None
+    xs = [math.log(n) for n, _ in samples]
+    ys = [math.log(elapsed) for _, elapsed in samples]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+
+    def spread(complexity: str) -> float:
+        ratios = [math.log(elapsed / COMPLEXITIES[complexity](n)) for n, elapsed in samples]
+        mean = sum(ratios) / len(ratios)
+        return sum((ratio - mean) ** 2 for ratio in ratios)
+
+    return ComplexityFit(phase, exponent, min(COMPLEXITIES, key=spread))
@@ -1,4 +1,6 @@
+import importlib
 import itertools
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 from typing import NamedTuple
@@ -12,15 +14,43 @@ class MissingType:
     def __repr__(self) -> str:
         return "MISSING"
 
+    def __reduce__(self) -> str:
+        # pickle by reference so `is MISSING` still holds in worker processes
+        return "MISSING"
+
 
 MISSING = MissingType()
 
 
+class LazyModule:
+    """
+    Stands in for a module until one of its attributes is used, e.g. `shapely = LazyModule("shapely")` at the top of a
+    day keeps the import out of runs that never reach the code using it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        value = getattr(self._module, attr)
+        # cached on the instance, later lookups (e.g. in a hot loop) no longer go through here
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+
 def root_dir() -> Path:
     return Path(__file__).parent.parent
 
 
-def pretty_grid(grid: list[list | Any], padding: int = 1) -> str:
+def pretty_grid(grid: "list[list | Any] | Grid", padding: int = 1) -> str:
+    if isinstance(grid, Grid):
+        grid = grid.lines()
     padding = max(padding, 0)
     lines = []
     if padding:
@@ -454,6 +484,121 @@ class Rectangle(NamedTuple):
         return self.contains(item)
 
 
+NEIGHBORS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DIAGONAL_NEIGHBORS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+
+class Grid:
+    """
+    Character grid stored row by row in a single bytearray (one byte per cell, ascii only).
+    Cells are indexed with `grid[x, y]` or `grid[point]`, bounds checked, or by flat index through `cells` for hot loops,
+    unchecked.
+    """
+
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: bytearray | None = None, fill: str = "."):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(fill.encode() * (width * height)) if cells is None else cells
+        assert len(self.cells) == width * height
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> Self:
+        assert len(lines) > 0
+        width = len(lines[0])
+        assert all(len(line) == width for line in lines)
+        return cls(width, len(lines), bytearray("".join(lines).encode()))
+
+    @property
+    def dimensions(self) -> Dimensions:
+        return Dimensions(self.width, self.height)
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def point(self, index: int) -> Point:
+        y, x = divmod(index, self.width)
+        return Point(x, y)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def row(self, y: int) -> memoryview:
+        start = y * self.width
+        return memoryview(self.cells)[start : start + self.width]
+
+    def column(self, x: int) -> memoryview:
+        return memoryview(self.cells)[x :: self.width]
+
+    def line(self, y: int) -> str:
+        start = y * self.width
+        return self.cells[start : start + self.width].decode()
+
+    def lines(self) -> list[str]:
+        return [self.line(y) for y in range(self.height)]
+
+    def neighbors(self, x: int, y: int, diagonal: bool = False) -> Iterator[Point]:
+        for x_offset, y_offset in DIAGONAL_NEIGHBORS if diagonal else NEIGHBORS:
+            nx = x + x_offset
+            ny = y + y_offset
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                yield Point(nx, ny)
+
+    def flat_offsets(self, diagonal: bool = False) -> tuple[int, ...]:
+        # only safe without bounds checks on a padded grid
+        return tuple(
+            y_offset * self.width + x_offset for x_offset, y_offset in (DIAGONAL_NEIGHBORS if diagonal else NEIGHBORS)
+        )
+
+    def padded(self, fill: str = ".", size: int = 1) -> Self:
+        grid = type(self)(self.width + size * 2, self.height + size * 2, fill=fill)
+        for y in range(self.height):
+            start = grid.index(size, y + size)
+            grid.cells[start : start + self.width] = self.row(y)
+        return grid
+
+    def find(self, value: str) -> Point | None:
+        index = self.cells.find(value.encode())
+        return None if index == -1 else self.point(index)
+
+    def find_all(self, value: str) -> list[Point]:
+        needle = ord(value)
+        return [self.point(index) for index, cell in enumerate(self.cells) if cell == needle]
+
+    def count(self, value: str) -> int:
+        return self.cells.count(value.encode())
+
+    def copy(self) -> Self:
+        return type(self)(self.width, self.height, self.cells[:])
+
+    def _checked_index(self, pos: Point | tuple[int, int]) -> int:
+        # an x outside the grid would otherwise wrap into the next row, and a negative y count from the end
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{pos} outside of {self.width}x{self.height} grid")
+        return y * self.width + x
+
+    def __getitem__(self, pos: Point | tuple[int, int]) -> str:
+        return chr(self.cells[self._checked_index(pos)])
+
+    def __setitem__(self, pos: Point | tuple[int, int], value: str) -> None:
+        self.cells[self._checked_index(pos)] = ord(value)
+
+    def __contains__(self, pos: Point | tuple[int, int]) -> bool:
+        x, y = pos
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Grid) and self.width == other.width and self.cells == other.cells
+
+    def __str__(self) -> str:
+        return "\n".join(self.lines())
+
+    def __repr__(self) -> str:
+        return f"Grid({self.dimensions})"
+
+
 class Color:
     # just some common ones, not meant to be exhaustive
     @staticmethod
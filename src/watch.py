@@ -0,0 +1,101 @@
+import hashlib
+import importlib
+import time
+import traceback
+from pathlib import Path
+from typing import Any
+
+import click
+from puzzle import Puzzle
+from runner import import_puzzle_module
+from runner import load_runner
+from runner import puzzle_parts
+from runner import runner_script_path
+from utils import Color
+from utils import root_dir
+
+from aoc import AdventOfCode
+
+
+class Watcher:
+    """
+    Polls a day module, its inputs and its runner script, and re-runs the parts whose source or input changed.
+    Parsed inputs are kept in memory (see `Puzzle.parse_memo`), only a changed input or parser parses again.
+    """
+
+    def __init__(self, year: int, day: int, interval: float = 0.5, **run_options: Any) -> None:
+        self.year = year
+        self.day = day
+        self.interval = interval
+        self.run_options = run_options
+        self.module = import_puzzle_module(year, day)
+        self.module_path = Path(self.module.__file__)
+        self.script_path = runner_script_path(year, day)
+        self.input_dir = root_dir().joinpath("io", AdventOfCode.formatted_year(year), "input")
+        self.mtimes: dict[Path, int] = {}
+        self.states: dict[int, tuple[str, str]] = {}
+
+    def watched_files(self) -> list[Path]:
+        return [
+            self.module_path,
+            self.script_path,
+            *self.input_dir.glob(f"{AdventOfCode.formatted_day(self.day)}*.in"),
+        ]
+
+    def changed_files(self) -> set[Path]:
+        mtimes = {}
+        for path in self.watched_files():
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except OSError:
+                pass
+        changed = {path for path in mtimes.keys() | self.mtimes.keys() if mtimes.get(path) != self.mtimes.get(path)}
+        self.mtimes = mtimes
+        return changed
+
+    def part_states(self) -> dict[int, tuple[str, str]]:
+        # source fingerprint and input digest of every part
+        states = {}
+        for part in puzzle_parts(self.module, self.day):
+            puzzle: Puzzle = getattr(self.module, AdventOfCode.puzzle_class(self.day, part))()
+            input_path = puzzle.puzzle_input_path()
+            input_digest = hashlib.sha256(input_path.read_bytes()).hexdigest() if input_path.exists() else ""
+            states[part] = (puzzle.source_fingerprint(), input_digest)
+        return states
+
+    def run_parts(self, parts: list[int]) -> None:
+        if not parts:
+            click.echo(Color.info("Nothing changed"))
+            return
+        click.echo(Color.info(f"{time.strftime('%H:%M:%S')} running part {', '.join(str(part) for part in parts)}"))
+        try:
+            # re-read every time, the tests or expected answers might have changed
+            runner = load_runner(self.year, self.day)
+            for part in parts:
+                runner.run(part, **self.run_options)
+        except Exception:
+            click.echo(traceback.format_exc(), nl=False)
+
+    def watch(self) -> None:
+        Puzzle.parse_memo = {}
+        self.changed_files()
+        self.states = self.part_states()
+        self.run_parts(sorted(self.states))
+        click.echo(Color.info(f"Watching {self.module_path.name}, its inputs and runner script, ctrl+c to stop"))
+        while True:
+            time.sleep(self.interval)
+            changed = self.changed_files()
+            if not changed:
+                continue
+            if self.module_path in changed:
+                try:
+                    importlib.reload(self.module)
+                except Exception:
+                    click.echo(traceback.format_exc(), nl=False)
+                    continue
+            states = self.part_states()
+            parts = [
+                part for part, state in states.items() if self.script_path in changed or self.states.get(part) != state
+            ]
+            self.states = states
+            self.run_parts(parts)
@@ -1,3 +1,4 @@
+import random
 from typing import Any
 from typing import TypedDict
 
@@ -113,5 +114,19 @@ class Day5Part1:
         print(self.solution(self.get_input()))
 
 
+def generate_input(scale: int, rng: random.Random) -> str:
+    # scale 1 is a real input: a rule for every pair of 49 pages and about 200 updates, a third of them in order
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.33:
+            update.sort(key=pages.index)
+        updates.append(",".join(str(page) for page in update))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates)
+
+
 if __name__ == "__main__":
     Day5Part1().solve()
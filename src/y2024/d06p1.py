@@ -1,3 +1,5 @@
+import math
+import random
 from typing import Any
 from typing import TypedDict
 
@@ -64,34 +66,68 @@ class Day6Part1:
                     return x, y, c
         raise ValueError("no guard found")
 
+    def get_jumps(self, lab: list[list[str]]) -> list[list[int]]:
+        """
+        For every direction (in "^>v<" order) and cell (y * x_size + x), the cell the guard stops at in front of the next
+        obstacle, -1 if it walks out of the lab instead.
+        """
+        x_size = len(lab[0])
+        y_size = len(lab)
+        jumps = [[-1] * (x_size * y_size) for _ in range(4)]
+        for x in range(x_size):
+            stop = -1
+            for y in range(y_size):
+                if lab[y][x] == "#":
+                    stop = (y + 1) * x_size + x
+                else:
+                    jumps[0][y * x_size + x] = stop
+            stop = -1
+            for y in reversed(range(y_size)):
+                if lab[y][x] == "#":
+                    stop = (y - 1) * x_size + x
+                else:
+                    jumps[2][y * x_size + x] = stop
+        for y in range(y_size):
+            stop = -1
+            for x in reversed(range(x_size)):
+                if lab[y][x] == "#":
+                    stop = y * x_size + x - 1
+                else:
+                    jumps[1][y * x_size + x] = stop
+            stop = -1
+            for x in range(x_size):
+                if lab[y][x] == "#":
+                    stop = y * x_size + x + 1
+                else:
+                    jumps[3][y * x_size + x] = stop
+        return jumps
+
     def solution(self, data: str) -> Any:
         lab = self.get_lines(data)[0]
         lab = [list(line) for line in lab]
         x, y, direction = self.get_guard_pos(lab)
-        lab[y][x] = "X"
         x_size = len(lab[0])
         y_size = len(lab)
-        directions = "^>v<"
-        instructions = {"v": (0, 1), "^": (0, -1), ">": (1, 0), "<": (-1, 0)}
-        visited = 1
+        jumps = self.get_jumps(lab)
+        # cell offsets for "^>v<"
+        steps = [-x_size, 1, x_size, -1]
+        d = "^>v<".index(direction)
+        pos = y * x_size + x
+        visited = bytearray(x_size * y_size)
+        visited[pos] = 1
         while True:
-            orig_x = x
-            orig_y = y
-            x_offset, y_offset = instructions[direction]
-            x += x_offset
-            y += y_offset
-            if x < 0 or x == x_size or y < 0 or y == y_size:
+            stop = jumps[d][pos]
+            if stop == -1:
+                # out of the lab, through the edge ahead
+                x, y = pos % x_size, pos // x_size
+                stop = [x, y * x_size + x_size - 1, (y_size - 1) * x_size + x, y * x_size][d]
+            for cell in range(pos, stop + steps[d], steps[d]):
+                visited[cell] = 1
+            if jumps[d][pos] == -1:
                 break
-            upcoming = lab[y][x]
-            if upcoming == "#":
-                direction = directions[(directions.index(direction) + 1) % 4]
-                x = orig_x
-                y = orig_y
-                continue
-            if upcoming == ".":
-                visited += 1
-            lab[y][x] = "X"
-        return visited
+            pos = stop
+            d = (d + 1) % 4
+        return sum(visited)
 
     def solve(self, test: bool | str = True) -> None:
         if isinstance(test, str):
@@ -104,5 +140,40 @@ class Day6Part1:
         print(self.solution(self.get_input()))
 
 
+def generate_input(scale: int, rng: random.Random) -> str:
+    """
+    Scale 1 is like a real input: a 130x130 lab, about 5% obstacles and a guard route of a few thousand cells. The
+    guard walks an outward spiral with uneven gaps until it leaves the lab, the other obstacles stay off the route.
+    """
+    size = round(130 * math.sqrt(scale))
+    directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    lab = [["." for _ in range(size)] for _ in range(size)]
+    x, y = size // 2 + rng.randint(-size // 10, size // 10), size // 2 + rng.randint(-size // 10, size // 10)
+    lab[y][x] = "^"
+    route = {(x, y)}
+    lengths = [0, 0]
+    direction = 0
+    while True:
+        # a side is longer than the parallel side before it, so the spiral never crosses itself
+        lengths.append(lengths[-2] + rng.randint(2, 5))
+        step_x, step_y = directions[direction]
+        for _ in range(lengths[-1]):
+            x, y = x + step_x, y + step_y
+            if not (0 <= x < size and 0 <= y < size):
+                break
+            route.add((x, y))
+        else:
+            if 0 <= x + step_x < size and 0 <= y + step_y < size:
+                lab[y + step_y][x + step_x] = "#"
+                direction = (direction + 1) % 4
+                continue
+        break
+    for y, row in enumerate(lab):
+        for x, cell in enumerate(row):
+            if cell == "." and (x, y) not in route and rng.random() < 0.05:
+                row[x] = "#"
+    return "\n".join("".join(row) for row in lab)
+
+
 if __name__ == "__main__":
     Day6Part1().solve()
@@ -1,3 +1,9 @@
+import os
+from array import array
+from collections.abc import Sequence
+from multiprocessing import parent_process
+from multiprocessing import Pool
+from multiprocessing import shared_memory
 from typing import Any
 from typing import TypedDict
 
@@ -7,7 +13,38 @@ class Data(TypedDict):
     expected: Any
 
 
+# jump tables of the lab being searched, attached once per worker process
+_shared_jumps: shared_memory.SharedMemory | None = None
+_worker_state: tuple[list[Sequence[int]], int, bytearray] | None = None
+
+
+def _attach_jumps(name: str, cells: int, x_size: int) -> None:
+    global _shared_jumps, _worker_state
+    _shared_jumps = shared_memory.SharedMemory(name=name)
+    table = _shared_jumps.buf.cast("i")
+    jumps = [table[d * cells : (d + 1) * cells] for d in range(4)]
+    _worker_state = jumps, x_size, bytearray(cells * 4)
+
+
+def _available_cpus() -> int:
+    # the cpus this process may run on, fewer than the machine has under taskset or a container cpuset
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _count_loops(candidates: list[tuple[int, int, int]]) -> int:
+    jumps, x_size, turns = _worker_state
+    part = Day6Part2(6, 2)
+    return sum(part.is_looping(jumps, x_size, pos, d, obstacle, turns) for obstacle, pos, d in candidates)
+
+
 class Day6Part2:
+    # the loop search runs in a pool once there are enough candidate obstacles to pay for it. A real input has ~5k, the
+    # break-even point on a multi-core machine hasn't been measured yet, so real inputs still run serially
+    workers = _available_cpus()
+    parallel_candidates = 10000
+
     __test__: Data = {
         "data": """
 ....#.....
@@ -64,24 +101,120 @@ class Day6Part2:
                     return x, y, c
         raise ValueError("no guard found")
 
-    def print(self, lab, guard_x=None, guard_y=None):
-        lines = []
-        translation = str.maketrans("^<>v", "|--|")
-        for y, line in enumerate(lab):
-            sb = []
-            for x, c in enumerate(line):
-                if x == guard_x and y == guard_y:
-                    c = "@"
-                elif c.startswith("*"):
-                    c = c[-1]
-                elif c.startswith("+"):
-                    c = c[0]
+    def get_jumps(self, lab: list[list[str]]) -> list[list[int]]:
+        """
+        For every direction (in "^>v<" order) and cell (y * x_size + x), the cell the guard stops at in front of the next
+        obstacle, -1 if it walks out of the lab instead.
+        """
+        x_size = len(lab[0])
+        y_size = len(lab)
+        jumps = [[-1] * (x_size * y_size) for _ in range(4)]
+        for x in range(x_size):
+            stop = -1
+            for y in range(y_size):
+                if lab[y][x] == "#":
+                    stop = (y + 1) * x_size + x
+                else:
+                    jumps[0][y * x_size + x] = stop
+            stop = -1
+            for y in reversed(range(y_size)):
+                if lab[y][x] == "#":
+                    stop = (y - 1) * x_size + x
+                else:
+                    jumps[2][y * x_size + x] = stop
+        for y in range(y_size):
+            stop = -1
+            for x in reversed(range(x_size)):
+                if lab[y][x] == "#":
+                    stop = y * x_size + x - 1
+                else:
+                    jumps[1][y * x_size + x] = stop
+            stop = -1
+            for x in range(x_size):
+                if lab[y][x] == "#":
+                    stop = y * x_size + x + 1
                 else:
-                    c = c.translate(translation)
-                sb.append(c)
-            lines.append("".join(sb))
-        print("\n".join(lines))
-        print("")
+                    jumps[3][y * x_size + x] = stop
+        return jumps
+
+    def get_stop(self, jumps: list[Sequence[int]], x_size: int, pos: int, d: int, obstacle: int) -> int:
+        # the jump with the extra obstacle, which only matters if it sits between pos and the jump's stop
+        stop = jumps[d][pos]
+        if d == 0:
+            if obstacle % x_size == pos % x_size and obstacle < pos and (stop == -1 or obstacle >= stop):
+                return obstacle + x_size
+        elif d == 1:
+            if obstacle // x_size == pos // x_size and obstacle > pos and (stop == -1 or obstacle <= stop):
+                return obstacle - 1
+        elif d == 2:
+            if obstacle % x_size == pos % x_size and obstacle > pos and (stop == -1 or obstacle <= stop):
+                return obstacle - x_size
+        elif obstacle // x_size == pos // x_size and obstacle < pos and (stop == -1 or obstacle >= stop):
+            return obstacle + 1
+        return stop
+
+    def is_looping(
+        self, jumps: list[Sequence[int]], x_size: int, pos: int, d: int, obstacle: int, turns: bytearray
+    ) -> bool:
+        # a loop comes back to a turn it already took, turns is a bitset of (pos, d) left cleared for the next search
+        taken = []
+        looping = False
+        while True:
+            pos = self.get_stop(jumps, x_size, pos, d, obstacle)
+            if pos == -1:
+                break
+            if turns[pos * 4 + d]:
+                looping = True
+                break
+            turns[pos * 4 + d] = 1
+            taken.append(pos * 4 + d)
+            d = (d + 1) % 4
+        for turn in taken:
+            turns[turn] = 0
+        return looping
+
+    def get_candidates(
+        self, jumps: list[list[int]], x_size: int, y_size: int, pos: int, d: int
+    ) -> list[tuple[int, int, int]]:
+        # an obstacle on a cell of the path, the first time the guard gets there, with the guard in front of it
+        steps = [-x_size, 1, x_size, -1]
+        visited = bytearray(x_size * y_size)
+        visited[pos] = 1
+        candidates = []
+        while True:
+            stop = jumps[d][pos]
+            if stop == -1:
+                x, y = pos % x_size, pos // x_size
+                stop = [x, y * x_size + x_size - 1, (y_size - 1) * x_size + x, y * x_size][d]
+            for cell in range(pos + steps[d], stop + steps[d], steps[d]):
+                if not visited[cell]:
+                    visited[cell] = 1
+                    candidates.append((cell, cell - steps[d], d))
+            if jumps[d][pos] == -1:
+                return candidates
+            pos = stop
+            d = (d + 1) % 4
+
+    def count_loops_parallel(self, jumps: list[list[int]], x_size: int, candidates: list[tuple[int, int, int]]) -> int:
+        # the workers share one read-only copy of the jump tables
+        cells = len(jumps[0])
+        shared = shared_memory.SharedMemory(create=True, size=4 * cells * 4)
+        try:
+            table = shared.buf.cast("i")
+            for d in range(4):
+                table[d * cells : (d + 1) * cells] = array("i", jumps[d])
+            del table
+            chunk_size = -(-len(candidates) // (self.workers * 4))
+            chunks = [candidates[i : i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+            with Pool(self.workers, initializer=_attach_jumps, initargs=(shared.name, cells, x_size)) as pool:
+                return sum(pool.map(_count_loops, chunks))
+        finally:
+            shared.close()
+            shared.unlink()
+
+    def use_pool(self, candidates: list[tuple[int, int, int]]) -> bool:
+        # child processes (batch workers, test pool workers) already share the cpus with their siblings
+        return self.workers > 1 and len(candidates) >= self.parallel_candidates and parent_process() is None
 
     def solution(self, data: str) -> Any:
         lab = self.get_lines(data)[0]
@@ -89,62 +222,12 @@ class Day6Part2:
         x, y, direction = self.get_guard_pos(lab)
         x_size = len(lab[0])
         y_size = len(lab)
-        directions = "^>v<"
-        lab_prime = None
-        x_prime = None
-        y_prime = None
-        direction_prime = None
-        looping_timelines = 0
-        instructions = {"v": (0, 1), "^": (0, -1), ">": (1, 0), "<": (-1, 0)}
-        lab[y][x] = f"*{direction}"
-        while True:
-            current_pos = lab[y][x]
-            orig_x = x
-            orig_y = y
-            x_offset, y_offset = instructions[direction]
-            x += x_offset
-            y += y_offset
-            if x < 0 or x == x_size or y < 0 or y == y_size:
-                if lab_prime:
-                    lab, x, y, direction = lab_prime, x_prime, y_prime, direction_prime
-                    lab_prime = None
-                    continue
-                else:
-                    break
-            upcoming_pos = lab[y][x]
-            if upcoming_pos[-1] == direction:
-                looping_timelines += 1
-                # print(looping_timelines)
-                # self.print(lab, orig_x, orig_y)
-                lab, x, y, direction = lab_prime, x_prime, y_prime, direction_prime
-                lab_prime = None
-            elif upcoming_pos[-1] in "#O":
-                direction = directions[(directions.index(direction) + 1) % 4]
-                if current_pos[0] == "+" and current_pos[-1] == direction:
-                    looping_timelines += 1
-                    # print(looping_timelines)
-                    # self.print(lab, orig_x, orig_y)
-                    lab, x, y, direction = lab_prime, x_prime, y_prime, direction_prime
-                    lab_prime = None
-                else:
-                    x = orig_x
-                    y = orig_y
-                    if current_pos[0] != "*":
-                        lab[y][x] = f"+{direction}"
-            elif upcoming_pos[-1] in directions and upcoming_pos[0] != "*":
-                lab[y][x] = f"+{upcoming_pos[-1]}"
-            elif upcoming_pos[-1] == ".":
-                lab[y][x] = direction
-                if not lab_prime:
-                    lab_prime = [line[:] for line in lab]
-                    x_prime = x
-                    y_prime = y
-                    direction_prime = direction
-                    lab[y][x] = "O"
-                    x = orig_x
-                    y = orig_y
-
-        return looping_timelines
+        jumps = self.get_jumps(lab)
+        candidates = self.get_candidates(jumps, x_size, y_size, y * x_size + x, "^>v<".index(direction))
+        if self.use_pool(candidates):
+            return self.count_loops_parallel(jumps, x_size, candidates)
+        turns = bytearray(len(jumps[0]) * 4)
+        return sum(self.is_looping(jumps, x_size, pos, d, obstacle, turns) for obstacle, pos, d in candidates)
 
     def solve(self, test: bool | str = True) -> None:
         if isinstance(test, str):
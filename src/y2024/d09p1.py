@@ -1,3 +1,4 @@
+import random
 from typing import Any
 from typing import TypedDict
 
@@ -7,6 +8,9 @@ class Data(TypedDict):
     expected: Any
 
 
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
 class Day9Part1:
     __test__: Data = {
         "data": """
@@ -53,47 +57,37 @@ class Day9Part1:
         expected = self.__test__["expected"]
         return data, expected
 
-    def print(self, filesystem):
-        print("".join(c[0] for c in filesystem))
-        print("")
+    def span_checksum(self, id: int, position: int, size: int) -> int:
+        # id times the sum of the positions of the span's blocks
+        return id * size * (2 * position + size - 1) // 2
 
-    def checksum(self, filesystem) -> int:
+    def solution(self, data: str) -> Any:
+        # run lengths only, files move span by span from the right into the gaps from the left
+        sizes = data.encode().translate(DIGIT_VALUES)
+        right = (len(sizes) - 1) // 2 * 2
+        remaining = sizes[right]
         checksum = 0
-        for i, block in enumerate(filesystem):
-            block = block[0]
-            if block == ".":
+        position = 0
+        for left, size in enumerate(sizes):
+            if left > right:
+                break
+            if left % 2 == 0:
+                if left == right:
+                    size = remaining
+                checksum += self.span_checksum(left // 2, position, size)
+                position += size
                 continue
-            id = int(block)
-            checksum += i * id
+            while size > 0 and right > left:
+                moved = min(size, remaining)
+                checksum += self.span_checksum(right // 2, position, moved)
+                position += moved
+                size -= moved
+                remaining -= moved
+                if remaining == 0:
+                    right -= 2
+                    remaining = sizes[right]
         return checksum
 
-    def solution(self, data: str) -> Any:
-        filesystem = []
-        id = 0
-        for i, digit in enumerate(data):
-            blocks = int(digit)
-            block = str(id) if i % 2 == 0 else "."
-            filesystem.extend([(block,) for _ in range(blocks)])
-            if block != ".":
-                id += 1
-        free_space = (".",)
-        if free_space not in filesystem:
-            return self.checksum(filesystem)
-        # self.print(filesystem)
-        free_space_pointer = filesystem.index(free_space)
-        block_pointer = 0
-        while free_space_pointer < len(filesystem) - block_pointer:
-            block_pointer += 1
-            block = filesystem[-block_pointer]
-            if block != free_space:
-                filesystem[free_space_pointer], filesystem[-block_pointer] = (
-                    block,
-                    free_space,
-                )
-                free_space_pointer = filesystem.index(free_space, free_space_pointer + 1)
-        # self.print(filesystem)
-        return self.checksum(filesystem)
-
     def solve(self, test: bool | str = True) -> None:
         if isinstance(test, str):
             print(self.solution(test))
@@ -105,5 +99,16 @@ class Day9Part1:
         print(self.solution(self.get_input()))
 
 
+def generate_input(scale: int, rng: random.Random) -> str:
+    # scale 1 is a real input: 10000 files of 1-9 blocks with 0-9 free blocks in between
+    files = 10_000 * scale
+    digits = []
+    for i in range(files):
+        digits.append(str(rng.randint(1, 9)))
+        if i < files - 1:
+            digits.append(str(rng.randint(0, 9)))
+    return "".join(digits)
+
+
 if __name__ == "__main__":
     Day9Part1().solve()
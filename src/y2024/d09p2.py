@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import heapq
+from array import array
+from itertools import accumulate
 from typing import Any
 from typing import TypedDict
 
@@ -8,21 +10,7 @@ class Data(TypedDict):
     expected: Any
 
 
-FREE_SPACE = "."
-
-
-@dataclass
-class File:
-    id: str
-    size: int
-    moved: bool = False
-
-    @property
-    def is_free_space(self):
-        return self.id == FREE_SPACE
-
-    def __repr__(self):
-        return self.id * self.size
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
 
 
 class Day9Part2:
@@ -71,72 +59,55 @@ class Day9Part2:
         expected = self.__test__["expected"]
         return data, expected
 
-    def print(self, filesystem: list[File], compact=False):
-        buffer = ["|"]
-        for file in filesystem:
-            if file.is_free_space or not compact:
-                buffer.append(file.id * file.size)
-            else:
-                buffer.append(f"{file.id}*{file.size}")
-            buffer.append("|")
-        print("".join(buffer))
-
-    def checksum(self, filesystem: list[File]) -> int:
-        checksum = 0
-        block = 0
-        for file in filesystem:
-            if not file.is_free_space:
-                id = int(file.id)
-                for i in range(file.size):
-                    checksum += (block + i) * id
-            block += file.size
-        return checksum
+    def get_disk(self, data: str) -> tuple[array, array, list[list[int]]]:
+        """
+        The position and size of every file (indexed by id), and a min-heap of the positions of the free spans of every
+        size, 1 to 9 (0 is always empty).
+        """
+        sizes = data.encode().translate(DIGIT_VALUES)
+        positions = list(accumulate(sizes, initial=0))
+        file_positions = array("q", positions[::2])
+        file_sizes = array("B", sizes[::2])
+        free_spans = [[] for _ in range(10)]
+        for size, position in zip(sizes[1::2], positions[1::2]):
+            if size > 0:
+                # positions only grow, each list is a heap already
+                free_spans[size].append(position)
+        return file_positions, file_sizes, free_spans
+
+    def checksum(self, file_positions: array, file_sizes: array) -> int:
+        # id times the sum of the positions of the file's blocks
+        return sum(
+            id * size * (2 * position + size - 1) // 2
+            for id, (position, size) in enumerate(zip(file_positions, file_sizes))
+        )
 
     def solution(self, data: str) -> Any:
-        filesystem: list[File] = []
-        id = 0
-        for i, digit in enumerate(data):
-            size = int(digit)
-            file = File(str(id) if i % 2 == 0 else FREE_SPACE, size)
-            if size > 0:
-                filesystem.append(file)
-            if not file.is_free_space:
-                id += 1
-        # self.print(filesystem)
-        file_pointer = len(filesystem) - 1
-        while file_pointer >= 0:
-            file = filesystem[file_pointer]
-            if file.moved or file.is_free_space:
-                file_pointer -= 1
+        file_positions, file_sizes, free_spans = self.get_disk(data)
+        # files only get further left, a size that doesn't fit anymore never will, nor any bigger one
+        fits_below = 10
+        for id in reversed(range(len(file_sizes))):
+            size = file_sizes[id]
+            if size >= fits_below:
+                continue
+            position = file_positions[id]
+            # the leftmost span the file fits in, from the heads of the heaps of big enough spans
+            span_size = None
+            span_position = position
+            for candidate in range(max(size, 1), fits_below):
+                heap = free_spans[candidate]
+                if heap and heap[0] < span_position:
+                    span_size = candidate
+                    span_position = heap[0]
+            if span_size is None:
+                fits_below = size
                 continue
-            # print(file.id)
-            free_pointer = None
-            for pointer, free_file in enumerate(filesystem):
-                if free_file is file:
-                    break
-                if free_file.is_free_space and file.size <= free_file.size:
-                    free_pointer = pointer
-                    break
-            if free_pointer is not None:
-                free_space = filesystem[free_pointer]
-                filesystem[file_pointer], filesystem[free_pointer] = free_space, file
-                file.moved = True
-                file_pointer, free_pointer = free_pointer, file_pointer
-                if free_space.size > file.size and free_pointer - file_pointer > 1:
-                    free_space_file = File(FREE_SPACE, free_space.size - file.size)
-                    filesystem.insert(file_pointer + 1, free_space_file)
-                    free_pointer += 1
-                    free_space.size = file.size
-                for offset in (1, -1):
-                    pointer = free_pointer + offset
-                    if 0 <= pointer < len(filesystem) and (free_file := filesystem[pointer]).is_free_space:
-                        free_space.size += free_file.size
-                        del filesystem[pointer]
-                        free_pointer = min(free_pointer, pointer)
-                file_pointer = free_pointer
-            file_pointer -= 1
-        # self.print(filesystem)
-        return self.checksum(filesystem)
+            heapq.heappop(free_spans[span_size])
+            file_positions[id] = span_position
+            # the space the file leaves is right of every file still to move, it never gets used
+            if span_size > size:
+                heapq.heappush(free_spans[span_size - size], span_position + size)
+        return self.checksum(file_positions, file_sizes)
 
     def solve(self, test: bool | str = True) -> None:
         if isinstance(test, str):
@@ -1,3 +1,6 @@
+import math
+import random
+from collections import deque
 from collections.abc import Iterator
 from dataclasses import dataclass
 from dataclasses import field
@@ -206,5 +209,28 @@ class Day10Part1:
         print(self.solution(self.get_input()))
 
 
+def generate_input(scale: int, rng: random.Random) -> str:
+    # scale 1 is a real input: a 50x50 map, hills sloping down from random peaks with a few odd cells
+    size = round(50 * math.sqrt(scale))
+    # distance to the nearest peak, breadth first from all of them
+    distances = [[-1] * size for _ in range(size)]
+    queue = deque()
+    for _ in range(size * size // 80):
+        x, y = rng.randrange(size), rng.randrange(size)
+        distances[y][x] = 0
+        queue.append((x, y))
+    while queue:
+        x, y = queue.popleft()
+        for next_x, next_y in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+            if 0 <= next_x < size and 0 <= next_y < size and distances[next_y][next_x] == -1:
+                distances[next_y][next_x] = distances[y][x] + 1
+                queue.append((next_x, next_y))
+    lines = []
+    for row in distances:
+        line = [str(rng.randrange(10) if rng.random() < 0.05 else max(0, 9 - distance)) for distance in row]
+        lines.append("".join(line))
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
     Day10Part1().solve()
@@ -1,69 +1,9 @@
 from collections.abc import Iterator
-from dataclasses import dataclass
-from dataclasses import field
-from dataclasses import InitVar
 from typing import Any
-from typing import Self
 
 
-@dataclass(frozen=True, repr=False)
-class Point:
-    x: int
-    y: int
-
-    def translate(self, x: int, y: int) -> Self:
-        return Point(self.x + x, self.y + y)
-
-    @property
-    def north(self) -> Self:
-        return self.translate(0, -1)
-
-    @property
-    def south(self) -> Self:
-        return self.translate(0, 1)
-
-    @property
-    def west(self) -> Self:
-        return self.translate(-1, 0)
-
-    @property
-    def east(self) -> Self:
-        return self.translate(1, 0)
-
-    def neighbors(self):
-        return [self.north, self.east, self.south, self.west]
-
-    def __repr__(self):
-        return f"({self.x}, {self.y})"
-
-    def __iter__(self):
-        return iter((self.x, self.y))
-
-    def __getitem__(self, index: int) -> int:
-        return list(self)[index]
-
-
-@dataclass
-class Grid:
-    lines: InitVar[list[str]]
-    cells: list[list[int | str]] = field(init=False)
-    width: int = field(init=False)
-    height: int = field(init=False)
-
-    def __post_init__(self, lines: list[str]):
-        self.cells = [[c if c == "." else int(c) for c in line] for line in lines]
-        self.width = len(self.cells[0])
-        self.height = len(self.cells)
-
-    def __getitem__(self, pt: Point | tuple[int, int]) -> int | str:
-        x, y = pt
-        return self.cells[y][x]
-
-    def __contains__(self, pt: Point) -> bool:
-        return 0 <= pt.x < self.width and 0 <= pt.y < self.height
-
-    def cells_with_height(self, height: int | str) -> list[Point]:
-        return [Point(x, y) for y, row in enumerate(self.cells) for x, cell in enumerate(row) if self[x, y] == height]
+# "." is impassable, it never is the next height up
+HEIGHTS = bytes.maketrans(b"0123456789.", bytes([*range(10), 255]))
 
 
 class Day10Part2:
@@ -147,41 +87,33 @@ class Day10Part2:
         assert len(cfg["data"]) == len(cfg["expected"])
         return zip([data.strip() for data in cfg["data"]], cfg["expected"])
 
+    def get_ratings(self, lines: list[str]) -> dict[tuple[int, int], int]:
+        """
+        The rating of every trailhead (x, y). A cell's rating is the number of trails from it up to a 9, the sum of the
+        ratings of its neighbors one higher, so it's filled in height by height from the 9s down.
+        """
+        # flat, with impassable cells above, below and at the end of every row, neighbors never need a bounds check
+        width = len(lines[0]) + 1
+        padding = "." * width
+        heights = f"{padding}{'.'.join(lines)}.{padding}".encode().translate(HEIGHTS)
+        cells_by_height = [[] for _ in range(10)]
+        for cell, height in enumerate(heights):
+            if height < 10:
+                cells_by_height[height].append(cell)
+        ratings = [0] * len(heights)
+        for cell in cells_by_height[9]:
+            ratings[cell] = 1
+        for height in reversed(range(9)):
+            for cell in cells_by_height[height]:
+                ratings[cell] = sum(
+                    ratings[neighbor]
+                    for neighbor in (cell - width, cell + 1, cell + width, cell - 1)
+                    if heights[neighbor] == height + 1
+                )
+        return {(cell % width, cell // width - 1): ratings[cell] for cell in cells_by_height[0]}
+
     def solution(self, data: str) -> Any:
-        grid = Grid(self.get_lines(data))
-        trail_heads = grid.cells_with_height(0)
-        # print(trail_heads)
-        queue = [[pt] for pt in trail_heads]
-        visited: dict[Point, list[list[Point]]] = {}
-        while queue:
-            path: list[Point] = queue.pop()
-            cell = path[-1]
-            if cell in visited:
-                for visited_path in visited[cell]:
-                    for previous_cell in reversed(path[:-1]):
-                        visited[previous_cell].append(visited_path)
-                continue
-            visited[cell] = []
-            height = grid[cell]
-            for neighbor in cell.neighbors():
-                if neighbor not in grid:
-                    continue
-                if (neighbor_height := grid[neighbor]) == ".":
-                    continue
-                if neighbor_height == height + 1:
-                    fork = path[:]
-                    fork.append(neighbor)
-                    if neighbor_height == 9:
-                        for previous_cell in reversed(path):
-                            visited[previous_cell].append(fork)
-                    queue.append(fork)
-        # print(trail_heads)
-        total = 0
-        for trail_start in trail_heads:
-            paths = visited[trail_start]
-            # print(trail_start, len(paths))
-            total += len(paths)
-        return total
+        return sum(self.get_ratings(self.get_lines(data)).values())
 
     def solve(self, test: bool | str = True) -> None:
         if isinstance(test, str):
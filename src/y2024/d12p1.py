@@ -1,3 +1,6 @@
+import math
+import random
+import string
 from collections.abc import Iterator
 from dataclasses import dataclass
 from dataclasses import field
@@ -226,5 +229,22 @@ MMMISSJEEE
         print(self.solution(self.get_input()))
 
 
+def generate_input(scale: int, rng: random.Random) -> str:
+    # scale 1 is a real input: 140x140 plots, regions are blocks of random plants with ragged edges
+    size = round(140 * math.sqrt(scale))
+    block = 6
+    blocks = size // block + 1
+    plants = [[rng.choice(string.ascii_uppercase) for _ in range(blocks)] for _ in range(blocks)]
+    rows = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            block_x = min(max((x + rng.randint(-2, 2)) // block, 0), blocks - 1)
+            block_y = min(max((y + rng.randint(-2, 2)) // block, 0), blocks - 1)
+            row.append(plants[block_y][block_x])
+        rows.append("".join(row))
+    return "\n".join(rows)
+
+
 if __name__ == "__main__":
     Day12Part1().solve()
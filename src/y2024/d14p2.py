@@ -4,10 +4,6 @@ from dataclasses import dataclass
 from typing import Any
 from typing import Self
 
-from PIL import Image
-from PIL import ImageDraw
-from PIL import ImageFont
-
 type Pair[T] = tuple[T, T]
 
 
@@ -101,6 +97,11 @@ class Day14Part2:
             filename = f"{output_dir}/grid{seconds:0>5}.jpg"
             if os.path.exists(filename):
                 return
+            # PIL is slow to import and only needed for the images
+            from PIL import Image
+            from PIL import ImageDraw
+            from PIL import ImageFont
+
             bg = 20
             fg = 210
             width = 750
@@ -1,9 +1,11 @@
-import functools
 import itertools
 import math
-import operator
+import random
+from collections.abc import Iterator
 
 from puzzle import Puzzle
+from puzzle import strategy
+from puzzle import Verbosity
 
 
 class Day2Part1(Puzzle):
@@ -67,7 +69,7 @@ class Day2Part2(Puzzle):
     def solution(self, parsed_data: list[tuple[str, str]]) -> int:
         invalid_id_sum = 0
         for lower_bound, upper_bound in parsed_data:
-            self.echo(f"### id_range=[{lower_bound}-{upper_bound}]")
+            self.log("### id_range=[%s-%s]", lower_bound, upper_bound)
             cache = {}
             min_id_size = len(lower_bound)
             max_id_size = len(upper_bound)
@@ -83,34 +85,58 @@ class Day2Part2(Puzzle):
                     if seq_start > seq_end:
                         continue
                     self.echo(
-                        f"{seq_size}x{group_count}: invalid_id_range=[{str(seq_start) * group_count}-{str(seq_end) * group_count}]"
+                        lambda: (
+                            f"{seq_size}x{group_count}: invalid_id_range=[{str(seq_start) * group_count}-{str(seq_end) * group_count}]"
+                        ),
+                        level=Verbosity.TRACE,
                     )
                     for seq in range(seq_start, seq_end + 1):
                         invalid_id = int(str(seq) * group_count)
                         if invalid_id in cache:
-                            self.echo(f"skipping cached id: {invalid_id}")
+                            self.log("skipping cached id: %d", invalid_id, level=Verbosity.TRACE)
                         else:
                             cache[invalid_id] = True
-                            self.echo(f"+{invalid_id=}")
+                            self.log("+invalid_id=%d", invalid_id, level=Verbosity.TRACE)
                             invalid_id_sum += invalid_id
         return invalid_id_sum
 
+    @strategy("brute_force")
+    def brute_force(self, parsed_data: list[tuple[str, str]]) -> int:
+        # every id of every range, checked against each of its prefixes
+        invalid_id_sum = 0
+        for lower_bound, upper_bound in parsed_data:
+            for id in range(int(lower_bound), int(upper_bound) + 1):
+                id_str = str(id)
+                for seq_size in range(1, len(id_str) // 2 + 1):
+                    if id_str == id_str[:seq_size] * (len(id_str) // seq_size):
+                        invalid_id_sum += id
+                        break
+        return invalid_id_sum
 
-def brute_force(lower_bound, upper_bound):
-    invalid_ids = []
-    for id in range(lower_bound, upper_bound + 1):
-        id_str = str(id)
-        mid = int(len(id_str) / 2)
-        ub = id_str[:mid]
-        for i in range(1, int(ub) + 1):
-            i_str = str(i)
-            invalid_id = i_str * int(len(id_str) / len(i_str))
-            if id_str == invalid_id:
-                invalid_ids.append(int(invalid_id))
-                break
-    print(f"invalid id count: {len(invalid_ids)}")
-    print(f"invalid id sum: {functools.reduce(operator.add, invalid_ids)}")
+
+def fuzz_input(rng: random.Random) -> str:
+    # a few narrow ranges, some of them crossing a power of ten
+    ranges = []
+    for _ in range(rng.randint(1, 4)):
+        if rng.random() < 0.3:
+            lower = max(1, 10 ** rng.randint(1, 7) - rng.randrange(100))
+        else:
+            lower = rng.randrange(1, 10 ** rng.randint(1, 8))
+        ranges.append(f"{lower}-{lower + rng.randrange(300)}")
+    return ",".join(ranges)
 
 
-if __name__ == "__main__":
-    brute_force(12, 8080)
+def fuzz_shrink(data: str) -> Iterator[str]:
+    # fewer ranges first, then narrower or shorter ones, never wider: the brute force stays as fast
+    ranges = [tuple(map(int, _range.split("-"))) for _range in data.split(",")]
+    variants = []
+    if len(ranges) > 1:
+        variants += [ranges[:i] + ranges[i + 1 :] for i in range(len(ranges))]
+    for i, (lower, upper) in enumerate(ranges):
+        middle = lower + (upper - lower) // 2
+        shorter = lower // 10, lower // 10 + min(upper // 10 - lower // 10, upper - lower)
+        for candidate in [(lower, middle), (middle + 1, upper), shorter, (lower + 1, upper), (lower, upper - 1)]:
+            if 0 < candidate[0] <= candidate[1] and candidate != (lower, upper):
+                variants.append(ranges[:i] + [candidate] + ranges[i + 1 :])
+    for variant in variants:
+        yield ",".join(f"{lower}-{upper}" for lower, upper in variant)
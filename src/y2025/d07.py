@@ -3,12 +3,13 @@ from functools import reduce
 
 import click
 from puzzle import Puzzle
+from puzzle import Verbosity
+from utils import Grid
 
-Manifold = list[list[str]]
 QuantumManifold = list[list[str | list[int]]]
 
 
-def pew_pew(manifold: Manifold | QuantumManifold) -> str:
+def pew_pew(manifold: list[str] | QuantumManifold) -> str:
     styled_manifold = []
     for row in manifold:
         styled_row = []
@@ -32,43 +33,35 @@ def pew_pew(manifold: Manifold | QuantumManifold) -> str:
 
 
 class Day7Part1(Puzzle):
-    def parse_data(self, data: str) -> Manifold:
+    def parse_data(self, data: str) -> Grid:
         return self.get_input_grid(data)
 
-    def solution(self, parsed_data: Manifold) -> int:
+    def solution(self, parsed_data: Grid) -> int:
         manifold = parsed_data
-        self.echo(pew_pew(manifold))
+        self.echo(lambda: pew_pew(manifold.lines()), level=Verbosity.TRACE)
         self.echo_divider()
         total_splits = 0
-        y = 1
-        while y < len(manifold):
-            row = manifold[y]
-            x = 0
-            while x < len(row):
-                cell = row[x]
-                above_cell = manifold[y - 1][x]
-                replace_cell = None
-                if above_cell in "S|":
-                    replace_cell = "|"
-                if replace_cell:
-                    if cell == "^":
-                        total_splits += 1
-                        if x - 1 >= 0:
-                            row[x - 1] = "|"
-                        if x + 1 < len(row):
-                            row[x + 1] = "|"
-                    else:
-                        row[x] = replace_cell
-                x += 1
-            y += 1
-            self.echo(pew_pew([row]))
+        for y in range(1, manifold.height):
+            for x in range(manifold.width):
+                if manifold[x, y - 1] not in "S|":
+                    continue
+                if manifold[x, y] == "^":
+                    total_splits += 1
+                    if x - 1 >= 0:
+                        manifold[x - 1, y] = "|"
+                    if x + 1 < manifold.width:
+                        manifold[x + 1, y] = "|"
+                else:
+                    manifold[x, y] = "|"
+            self.echo(lambda: pew_pew([manifold.line(y)]), level=Verbosity.TRACE)
         return total_splits
 
 
 class Day7Part2(Puzzle):
     def parse_data(self, data: str) -> QuantumManifold:
         assert "^^" not in data
-        return self.get_input_grid(data)
+        # cells end up holding beam lists, so this one stays a nested list
+        return [list(line) for line in self.get_input_lines(data)]
 
     def solution(self, parsed_data: QuantumManifold) -> int:
         manifold = parsed_data
@@ -1,11 +1,13 @@
 import math
 import operator
+import random
 from functools import reduce
 from operator import itemgetter
 from typing import NamedTuple
 from typing import Self
 
 from puzzle import Puzzle
+from puzzle import Verbosity
 from utils import Color
 
 
@@ -28,14 +30,19 @@ class Point3D(NamedTuple):
         return _distance
 
 
+type Distance = tuple[int, tuple[Point3D, Point3D]]
+
+
 class Day8(Puzzle):
+    parse_cache_version = 1
+
     def _styled_junctions(self, *junctions: Point3D) -> str:
         return "->".join(Color.cyan(j) for j in junctions)
 
     def _styled_circuit(self, circuit: dict[Point3D, bool]) -> str:
         return self._styled_junctions(*circuit.keys())
 
-    def get_distances(self, points: list[Point3D]) -> list[tuple[int, tuple[Point3D, Point3D]]]:
+    def get_distances(self, points: list[Point3D]) -> list[Distance]:
         distances = []
         for i, junction_a in enumerate(points[:-1]):
             for junction_b in points[i + 1 :]:
@@ -50,18 +57,26 @@ class Day8(Puzzle):
         junction_a: Point3D,
         junction_b: Point3D,
     ):
-        self.echo(f"Making connection {Color.highlight(connection)}: {self._styled_junctions(junction_a, junction_b)}")
+        self.echo(
+            lambda: (
+                f"Making connection {Color.highlight(connection)}: {self._styled_junctions(junction_a, junction_b)}"
+            ),
+            level=Verbosity.TRACE,
+        )
         circuit_a = connected_junctions.get(junction_a, None)
         circuit_b = connected_junctions.get(junction_b, None)
         if circuit_a is None and circuit_b is None:
-            self.echo("++ New circuit!")
+            self.echo("++ New circuit!", level=Verbosity.TRACE)
             circuit = {junction_a: True, junction_b: True}
             connected_junctions[junction_a] = circuit
             connected_junctions[junction_b] = circuit
         elif circuit_a is circuit_b:
-            self.echo("== Both junctions in same circuit")
+            self.echo("== Both junctions in same circuit", level=Verbosity.TRACE)
         elif circuit_a and circuit_b:
-            self.echo(f">< Merging 2 circuits: {self._styled_circuit(circuit_a)}+{self._styled_circuit(circuit_b)}")
+            self.echo(
+                lambda: f">< Merging 2 circuits: {self._styled_circuit(circuit_a)}+{self._styled_circuit(circuit_b)}",
+                level=Verbosity.TRACE,
+            )
             circuit_a.update(circuit_b)
             for junction in circuit_a:
                 connected_junctions[junction] = circuit_a
@@ -72,26 +87,27 @@ class Day8(Puzzle):
             ]
             for circuit, new_junction in params:
                 if circuit:
-                    self.echo(f">> Adding {Color.cyan(new_junction)} to {self._styled_circuit(circuit)}")
+                    self.echo(
+                        lambda: f">> Adding {Color.cyan(new_junction)} to {self._styled_circuit(circuit)}",
+                        level=Verbosity.TRACE,
+                    )
                     circuit[new_junction] = True
                     connected_junctions[new_junction] = circuit
 
 
 class Day8Part1(Day8):
-    def parse_data(self, data: str) -> tuple[list[Point3D], int]:
+    def parse_data(self, data: str) -> tuple[list[Point3D], list[Distance], int]:
         raw_points, connections = self.get_input_groups(data)
         assert len(connections) == 1
         points = [Point3D(*[int(n) for n in coords.split(",")]) for coords in raw_points]
-        return points, int(connections[0])
+        return points, self.get_distances(points), int(connections[0])
 
-    def solution(self, parsed_data: tuple[list[Point3D], int]) -> int:
-        points, max_connections = parsed_data
-        self.echo("\n".join(str(pt) for pt in points))
-        self.echo(f"{max_connections=}")
+    def solution(self, parsed_data: tuple[list[Point3D], list[Distance], int]) -> int:
+        points, distances, max_connections = parsed_data
+        self.echo(lambda: "\n".join(str(pt) for pt in points))
+        self.log("max_connections=%d", max_connections)
         self.echo_divider()
 
-        distances = self.get_distances(points)
-
         connected_junctions: dict[Point3D, dict[Point3D, bool]] = {}
         for conn, (_, (junction_a, junction_b)) in enumerate(sorted(distances)[:max_connections], start=1):
             self.make_connection(conn, connected_junctions, junction_a, junction_b)
@@ -102,38 +118,47 @@ class Day8Part1(Day8):
             if circuit not in circuits:
                 circuits.append(circuit)
         circuits = sorted(circuits, key=len, reverse=True)
-        self.echo("\n".join(f"{len(c)}: {self._styled_circuit(c)}" for c in circuits))
+        self.echo(lambda: "\n".join(f"{len(c)}: {self._styled_circuit(c)}" for c in circuits))
         largest_three_circuits = [len(circuits[i]) if i < len(circuits) else 1 for i in range(3)]
         return reduce(operator.mul, largest_three_circuits)
 
 
 class Day8Part2(Day8):
-    def parse_data(self, data: str) -> list[Point3D]:
+    def parse_data(self, data: str) -> tuple[list[Point3D], list[Distance]]:
         raw_points, _ = self.get_input_groups(data)
         points = [Point3D(*[int(n) for n in coords.split(",")]) for coords in raw_points]
-        return points
+        return points, self.get_distances(points)
 
-    def solution(self, parsed_data: list[Point3D]) -> int:
-        self.echo("\n".join(str(pt) for pt in parsed_data))
+    def solution(self, parsed_data: tuple[list[Point3D], list[Distance]]) -> int:
+        points, distances = parsed_data
+        self.echo(lambda: "\n".join(str(pt) for pt in points))
         self.echo_divider()
 
-        distances = self.get_distances(parsed_data)
-
         connected_junctions = {}
         for conn, (_, (junction_a, junction_b)) in enumerate(sorted(distances, key=itemgetter(0)), start=1):
             self.make_connection(conn, connected_junctions, junction_a, junction_b)
-            if len(connected_junctions) == len(parsed_data) - 1:
+            if len(connected_junctions) == len(points) - 1:
                 break
 
         self.echo_divider()
         free_junction = None
-        for junction in parsed_data:
+        for junction in points:
             if junction not in connected_junctions:
                 free_junction = junction
                 break
         final_distances = [(free_junction.sort_distance(junction), junction) for junction in connected_junctions]
         final_distances = sorted(final_distances, key=itemgetter(0))
         connect_junction = final_distances[0][1]
-        self.echo(f"Final connection {self._styled_junctions(free_junction, connect_junction)}")
+        self.echo(lambda: f"Final connection {self._styled_junctions(free_junction, connect_junction)}")
 
         return free_junction.x * connect_junction.x
+
+
+def generate_input(scale: int, rng: random.Random) -> str:
+    # scale 1 is a real input: 1000 junction boxes and 1000 connections
+    count = 1000 * scale
+    points = {}
+    while len(points) < count:
+        points[(rng.randrange(100_000), rng.randrange(100_000), rng.randrange(100_000))] = True
+    lines = [f"{x},{y},{z}" for x, y, z in points]
+    return "\n".join(lines) + f"\n\n{count}\n"
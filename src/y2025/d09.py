@@ -1,12 +1,19 @@
 import itertools
+import random
 from operator import itemgetter
+from typing import TYPE_CHECKING
 
-import shapely
 from puzzle import Puzzle
-from shapely import box
-from shapely import Polygon
+from puzzle import Verbosity
+from utils import LazyModule
 from utils import Point
 
+if TYPE_CHECKING:
+    from shapely import Polygon
+
+# only imported once a solution runs, cached answers and other days skip it
+shapely = LazyModule("shapely")
+
 
 class Day9(Puzzle):
     def parse_data(self, data: str) -> list[Point]:
@@ -14,17 +21,18 @@ class Day9(Puzzle):
         red_tiles = {Point(*line): True for line in parsed_lines}
         return list(red_tiles.keys())
 
-    def _tile_area(self, polygon: Polygon) -> int:
+    def _tile_area(self, polygon: "Polygon") -> int:
         return int(polygon.area + (polygon.length / 2) + 1)
 
 
 class Day9Part1(Day9):
     def solution(self, parsed_data: list[Point]) -> int:
-        self.echo("\n".join(str(pt) for pt in parsed_data))
+        self.echo(lambda: "\n".join(str(pt) for pt in parsed_data))
         self.echo_divider()
 
         rects = [
-            (rect := box(a.x, a.y, b.x, b.y), self._tile_area(rect)) for a, b in itertools.combinations(parsed_data, 2)
+            (rect := shapely.box(a.x, a.y, b.x, b.y), self._tile_area(rect))
+            for a, b in itertools.combinations(parsed_data, 2)
         ]
         largest_rect, tile_area = next(reversed(sorted(rects, key=itemgetter(1))))
         return tile_area
@@ -32,18 +40,19 @@ class Day9Part1(Day9):
 
 class Day9Part2(Day9):
     def solution(self, parsed_data: list[Point]) -> int:
-        self.echo("\n".join(str(pt) for pt in parsed_data))
+        self.echo(lambda: "\n".join(str(pt) for pt in parsed_data))
         self.echo_divider()
-        polygon = Polygon(parsed_data)
+        polygon = shapely.Polygon(parsed_data)
         max_area = self._tile_area(polygon)
         shapely.prepare(polygon)
         rects = [
-            (rect := box(a.x, a.y, b.x, b.y), self._tile_area(rect)) for a, b in itertools.combinations(parsed_data, 2)
+            (rect := shapely.box(a.x, a.y, b.x, b.y), self._tile_area(rect))
+            for a, b in itertools.combinations(parsed_data, 2)
         ]
         for rect, tile_area in reversed(sorted(rects, key=itemgetter(1))):
-            self.echo(f"testing {rect}={tile_area}")
+            self.echo(lambda: f"testing {rect}={tile_area}", level=Verbosity.TRACE)
             if tile_area > max_area:
-                self.echo("too big")
+                self.echo("too big", level=Verbosity.TRACE)
                 continue
             bounds = rect.bounds
             if bounds[0] == bounds[2] or bounds[1] == bounds[3]:
@@ -53,3 +62,25 @@ class Day9Part2(Day9):
                 self.echo("solution found!")
                 return tile_area
         raise ValueError("No solution found!")
+
+
+def generate_input(scale: int, rng: random.Random) -> str:
+    # an x-monotone orthogonal polygon: a staircase along the top and another one back along the bottom
+    # scale 1 has about as many red tiles as a real input
+    columns = 125 * scale
+
+    def staircase(low: int, high: int) -> list[int]:
+        # neighbouring steps differ, otherwise their corners would be collinear
+        heights = [rng.randrange(low, high)]
+        while len(heights) < columns:
+            if (height := rng.randrange(low, high)) != heights[-1]:
+                heights.append(height)
+        return heights
+
+    xs = sorted(rng.sample(range(1, 800 * columns), columns + 1))
+    points = []
+    for i, top in enumerate(staircase(60_000, 100_000)):
+        points.extend([(xs[i], top), (xs[i + 1], top)])
+    for i, bottom in reversed(list(enumerate(staircase(1, 40_000)))):
+        points.extend([(xs[i + 1], bottom), (xs[i], bottom)])
+    return "\n".join(f"{x},{y}" for x, y in points) + "\n"